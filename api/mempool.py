@@ -2,52 +2,125 @@
 Mempool API client for fetching blockchain data.
 """
 
-from subprocess import run
+from base64 import b64encode
+from http.client import CannotSendRequest, HTTPConnection, RemoteDisconnected
+from pathlib import Path
+from urllib.request import urlopen
 import json
+import time
+
+# Recommended fee rates are reused for this many seconds after they are fetched
+FEE_CACHE_SECONDS = 30
+
+# Last successful fee rate fetch: (base_url, monotonic fetch time, fee rates)
+_fee_rate_cache = None
+
+# Errors raised when a reused keep-alive connection has been closed by the node
+_STALE_CONNECTION_ERRORS = (CannotSendRequest, RemoteDisconnected, BrokenPipeError, ConnectionResetError)
 
 
 class MempoolAPI:
     """Client for interacting with mempool.space API."""
 
-    def __init__(self, base_url: str = "https://mempool.space/api"):
+    def __init__(self, base_url: str = "https://mempool.space/api", timeout: float = 5.0,
+                 rpc_host: str = "127.0.0.1", rpc_port: int = 8332,
+                 rpc_cookie: str = "~/.bitcoin/.cookie"):
         """
         Initialize the Mempool API client.
 
         Args:
             base_url: Base URL for the mempool API (default: mainnet)
+            timeout: Seconds to wait for a remote response
+            rpc_host: Host of the local Bitcoin Core JSON-RPC server
+            rpc_port: Port of the local Bitcoin Core JSON-RPC server
+            rpc_cookie: Path to the Bitcoin Core RPC auth cookie file
         """
         self.base_url = base_url
+        self.timeout = timeout
+        self.rpc_host = rpc_host
+        self.rpc_port = rpc_port
+        self.rpc_cookie = rpc_cookie
+        self._rpc_conn = None
+        self._rpc_auth = None
+
+    def local_rpc(self, method: str, params: list | None = None):
+        """
+        Call a method on the local Bitcoin Core node over JSON-RPC.
 
-    def local_rpc(self, cmd: str):
-        res = run(
-            ["sudo", "bitcoin-cli", "mainnet"] + cmd.split(" "),
-            capture_output=True,
-            encoding="utf-8")
-        if res.returncode == 0:
-            return res.stdout.strip()
-        else:
-            raise Exception(res.stderr.strip())
+        The HTTP connection and cookie credentials are set up on first use
+        and reused by later calls. If the node has dropped the reused
+        connection, the call is retried once on a fresh one.
+
+        Args:
+            method: RPC method name (e.g. "getblockcount")
+            params: Positional RPC parameters
+
+        Returns:
+            The "result" field of the RPC response
+
+        Raises:
+            Exception: If the node returns an HTTP or RPC error
+        """
+        body = json.dumps({"jsonrpc": "1.0", "id": "psbt_parser", "method": method, "params": params or []})
+        try:
+            try:
+                res = self._rpc_post(body)
+            except _STALE_CONNECTION_ERRORS:
+                self._close_rpc()
+                res = self._rpc_post(body)
+            if res.get("error"):
+                raise Exception(res["error"].get("message", res["error"]))
+            return res["result"]
+        except Exception:
+            # Never reuse a connection left in an unknown state
+            self._close_rpc()
+            raise
+
+    def _rpc_post(self, body: str):
+        """POST one JSON-RPC request body and return the decoded response."""
+        if self._rpc_conn is None:
+            cookie = Path(self.rpc_cookie).expanduser().read_text().strip()
+            self._rpc_auth = "Basic " + b64encode(cookie.encode()).decode()
+            self._rpc_conn = HTTPConnection(self.rpc_host, self.rpc_port, timeout=self.timeout)
+
+        self._rpc_conn.request("POST", "/", body, {
+            "Authorization": self._rpc_auth,
+            "Content-Type": "application/json"
+        })
+        response = self._rpc_conn.getresponse()
+        data = response.read()
+        if response.status != 200:
+            # RPC errors also arrive with a non-200 status, but carry a JSON error body
+            try:
+                res = json.loads(data)
+            except ValueError:
+                res = None
+            if not (isinstance(res, dict) and res.get("error")):
+                raise Exception(f"RPC request failed: HTTP {response.status} {response.reason}")
+            return res
+        return json.loads(data)
+
+    def _close_rpc(self):
+        """Close and forget the cached RPC connection."""
+        if self._rpc_conn is not None:
+            self._rpc_conn.close()
+            self._rpc_conn = None
 
     def remote_rpc(self, url: str):
         """
-        Execute a remote GET request using curl.
+        Execute a remote GET request in-process.
 
         Args:
-            url: Full URL to request
+            url: Path to request, relative to base_url
 
         Returns:
             Parsed JSON response or None if the request fails
         """
         try:
-            res = run(
-                ["curl", "-sSL", self.base_url + url],
-                capture_output=True,
-                encoding="utf-8"
-            )
-            if res.returncode == 0 and res.stdout.strip():
-                return json.loads(res.stdout.strip())
-            else:
-                return None
+            with urlopen(self.base_url + url, timeout=self.timeout) as res:
+                if res.status != 200:
+                    return None
+                return json.load(res)
         except (json.JSONDecodeError, Exception):
             return None
 
@@ -55,8 +128,20 @@ class MempoolAPI:
         """
         Fetch recommended fee rate.
 
+        Results are shared across MempoolAPI instances with the same base_url
+        for FEE_CACHE_SECONDS after each fetch, so repeated calls skip the
+        network round trip.
+        Failed requests are not cached.
+
         Returns:
             Recommended fee rate
         """
-        return self.remote_rpc("/v1/fees/recommended")
-
+        global _fee_rate_cache
+        now = time.monotonic()
+        cached = _fee_rate_cache
+        if cached is not None and cached[0] == self.base_url and now - cached[1] < FEE_CACHE_SECONDS:
+            return cached[2]
+        fee_rates = self.remote_rpc("/v1/fees/recommended")
+        if fee_rates is not None:
+            _fee_rate_cache = (self.base_url, now, fee_rates)
+        return fee_rates
@@ -1,6 +1,7 @@
 """
 Bitcoin constants and values
 """
+from types import MappingProxyType
 
 # Bitcoin Script Opcodes
 OP_0 = 0x00
@@ -14,7 +15,7 @@ OP_HASH160 = 0xa9
 OP_CHECKSIG = 0xac
 
 # Global Key Types Dictionary (BIP-174)
-PSBT_GLOBAL_TYPES = {
+PSBT_GLOBAL_TYPES = MappingProxyType({
     0: "PSBT_GLOBAL_UNSIGNED_TX",
     1: "PSBT_GLOBAL_XPUB",
     2: "PSBT_GLOBAL_TX_VERSION",
@@ -26,10 +27,10 @@ PSBT_GLOBAL_TYPES = {
     8: "PSBT_GLOBAL_SP_DLEQ_PROOF",
     251: "PSBT_GLOBAL_VERSION",
     252: "PSBT_GLOBAL_PROPRIETARY"
-}
+})
 
 # Per-Input Key Types Dictionary (BIP-174)
-PSBT_IN_TYPES = {
+PSBT_IN_TYPES = MappingProxyType({
     0: "PSBT_IN_NON_WITNESS_UTXO",
     1: "PSBT_IN_WITNESS_UTXO",
     2: "PSBT_IN_PARTIAL_SIG",
@@ -61,10 +62,10 @@ PSBT_IN_TYPES = {
     29: "PSBT_IN_SP_ECDH_SHARE",
     30: "PSBT_IN_SP_DLEQ_PROOF",
     252: "PSBT_IN_PROPRIETARY"
-}
+})
 
 # Per-Output Key Types Dictionary (BIP-174)
-PSBT_OUT_TYPES = {
+PSBT_OUT_TYPES = MappingProxyType({
     0: "PSBT_OUT_REDEEM_SCRIPT",
     1: "PSBT_OUT_WITNESS_SCRIPT",
     2: "PSBT_OUT_BIP32_DERIVATION",
@@ -74,7 +75,7 @@ PSBT_OUT_TYPES = {
     6: "PSBT_OUT_TAP_TREE",
     7: "PSBT_OUT_TAP_BIP32_DERIVATION",
     252: "PSBT_OUT_PROPRIETARY"
-}
+})
 
 # Automatically create constants from dictionaries
 globals().update({name: value for value, name in PSBT_GLOBAL_TYPES.items()})
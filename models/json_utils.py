@@ -0,0 +1,51 @@
+"""
+JSON serialization shared by the model classes
+"""
+import json
+
+# Buffered output size for dump(): one fp.write per chunk
+DUMP_CHUNK_SIZE = 1 << 16
+
+try:
+    import orjson
+except ImportError:  # optional; fall back to the stdlib encoder
+    orjson = None
+
+def hex_default(obj):
+    """JSON default hook: encode raw bytes as hex strings."""
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return obj.hex()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+def dumps(obj):
+    """Serialize obj as JSON indented by 2 spaces, using orjson if installed.
+
+    Byte strings left in obj (key and value data) are hex-encoded by the
+    serializer itself, once per field, during the single dump pass.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, default=hex_default, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2, default=hex_default)
+
+def dump(obj, fp, chunk_size=DUMP_CHUNK_SIZE):
+    """Write obj to the text file fp as JSON, formatted like dumps().
+
+    With the stdlib encoder the output is produced incrementally and
+    written in batches of about chunk_size characters, so the full document
+    is never held as one string. orjson has no incremental mode, so it
+    encodes in one pass and writes once.
+    """
+    if orjson is not None:
+        fp.write(dumps(obj))
+        return
+    chunks = []
+    size = 0
+    for chunk in json.JSONEncoder(indent=2, default=hex_default).iterencode(obj):
+        chunks.append(chunk)
+        size += len(chunk)
+        if size >= chunk_size:
+            fp.write(''.join(chunks))
+            chunks.clear()
+            size = 0
+    if chunks:
+        fp.write(''.join(chunks))
@@ -6,14 +6,15 @@ import json
 
 class PsbtKeyInWitnessUTXO:
     """Model for PSBT_IN_WITNESS_UTXO data."""
+    __slots__ = ("amount", "script_hash")
 
-    def __init__(self, amount: int, script_hash: str):
+    def __init__(self, amount: int, script_hash: bytes):
         """
         Initialize a PsbtKeyInWitnessUTXO object.
 
         Args:
             amount: Amount in satoshis
-            script_hash: Script hash as hex string
+            script_hash: scriptPubKey bytes (hex-encoded only by to_string)
         """
         self.amount = amount
         self.script_hash = script_hash
@@ -22,18 +23,19 @@ class PsbtKeyInWitnessUTXO:
         """Convert to JSON string representation."""
         return json.dumps({
             "amount": self.amount,
-            "script_hash": self.script_hash
+            "script_hash": self.script_hash.hex()
         })
 
 class PsbtKeyOutBIP32Derivation:
     """Model for PSBT_OUT_BIP32_DERIVATION data."""
+    __slots__ = ("fingerprint", "indices", "hardened", "is_change", "_path")
 
-    def __init__(self, fingerprint: bytes, indices: list[int], hardened: list[bool], is_change: bool):
+    def __init__(self, fingerprint: str, indices: list[int], hardened: list[bool], is_change: bool):
         """
         Initialize a PsbtKeyOutBIP32Derivation object.
 
         Args:
-            fingerprint: Master key fingerprint as bytes
+            fingerprint: Master key fingerprint as hex string
             indices: List of derivation path indices
             hardened: List of booleans indicating if each index is hardened
             is_change: Boolean indicating if the output is a change output
@@ -42,20 +44,13 @@ class PsbtKeyOutBIP32Derivation:
         self.indices = indices
         self.hardened = hardened
         self.is_change = is_change
+        # Build path string once, in format: m/44'/0'/0'/0/0
+        self._path = "/".join(["m", *(f"{index}'" if h else str(index) for index, h in zip(indices, hardened))])
 
     def to_string(self):
         """Convert to JSON string representation."""
-        # Build path string in format: m/44'/0'/0'/0/0
-        path_parts = ["m"]
-        for i, index in enumerate(self.indices):
-            part = str(index)
-            if self.hardened[i]:
-                part += "'"
-            path_parts.append(part)
-        path = "/".join(path_parts)
-
         return json.dumps({
-            "fingerprint": self.fingerprint.hex(),
-            "path": path,
+            "fingerprint": self.fingerprint,
+            "path": self._path,
             "is_change": self.is_change
         })
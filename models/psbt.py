@@ -1,159 +1,254 @@
 """
 PSBT data structure classes
 """
-import json
-from enum import Enum
-from pydantic import BaseModel, Field, model_validator, field_validator, ConfigDict
+import sys
+from dataclasses import dataclass, field
+from enum import IntEnum
 from models.constants import PSBT_GLOBAL_TYPES, PSBT_IN_TYPES, PSBT_OUT_TYPES
+from models.constants import PSBT_IN_WITNESS_SCRIPT, PSBT_IN_FINAL_SCRIPTSIG, PSBT_IN_FINAL_SCRIPTWITNESS, PSBT_OUT_SCRIPT
+from models.json_utils import dump, dumps
 
-class PSBTMapType(Enum):
-    """Enum for PSBT map types."""
-    GLOBAL = "GLOBAL"
-    INPUT = "INPUT"
-    OUTPUT = "OUTPUT"
 
-class PSBTKey(BaseModel):
-    model_config = ConfigDict(populate_by_name=True, use_enum_values=False)
+class PSBTMapType(IntEnum):
+    """Enum for PSBT map types.
 
-    key_len: int = Field(ge=0)
-    key_type: int = Field(ge=0)
+    Members are ints so they compare and index like plain integers; the
+    member name is used as the serialized map type.
+    """
+    GLOBAL = 0
+    INPUT = 1
+    OUTPUT = 2
+
+# Serialized map type names, indexed by PSBTMapType
+_MAP_TYPE_NAMES = tuple(sys.intern(map_type.name) for map_type in PSBTMapType)
+
+# Key type names, indexed by PSBTMapType and then by key_type. Defined key
+# types are single-byte compact sizes (0x00-0xfc); anything above is UNKNOWN.
+_KEY_TYPE_LIMIT = 0xfd
+_TYPE_NAMES = tuple(
+    tuple(table.get(key_type, "UNKNOWN") for key_type in range(_KEY_TYPE_LIMIT))
+    for table in (PSBT_GLOBAL_TYPES, PSBT_IN_TYPES, PSBT_OUT_TYPES)
+)
+
+@dataclass(slots=True)
+class PSBTKey:
+    # key_len == len(key_data) + compact_size_length(key_type) is checked by
+    # PSBTParser.parse_key when the key is read.
+    key_len: int
+    key_type: int
     key_data: bytes
-    map_type: PSBTMapType = Field(alias='type')
-
-    @model_validator(mode='after')
-    def check_size_matches(self):
-        # key_len should equal len(key_data) + compact_size_length(key_type)
-        # For PSBT key types (all < 253), compact size is always 1 byte
-        if self.key_type < 0xfd:
-            key_type_len = 1
-        elif self.key_type <= 0xffff:
-            key_type_len = 3
-        elif self.key_type <= 0xffffffff:
-            key_type_len = 5
-        else:
-            key_type_len = 9
-
-        expected_len = len(self.key_data) + key_type_len
-        if self.key_len != expected_len:
-            raise ValueError(f'key_len {self.key_len} != len(key_data) + key_type_len ({expected_len})')
-        return self
+    type: PSBTMapType
 
-    def to_string(self):
-        # Select the appropriate dictionary based on the type field
-        if self.map_type == PSBTMapType.GLOBAL:
-            key_type_name = PSBT_GLOBAL_TYPES.get(self.key_type, "UNKNOWN")
-        elif self.map_type == PSBTMapType.INPUT:
-            key_type_name = PSBT_IN_TYPES.get(self.key_type, "UNKNOWN")
-        elif self.map_type == PSBTMapType.OUTPUT:
-            key_type_name = PSBT_OUT_TYPES.get(self.key_type, "UNKNOWN")
-        else:
-            key_type_name = "UNKNOWN"
-
-        return json.dumps({
-            "key_len": self.key_len,
-            "key_type": self.key_type,
-            "key_type_name": key_type_name,
-            "key_data": self.key_data.hex(),
-            "type": self.map_type.value
-        }, indent=2)
-
-class PSBTVal(BaseModel):
-    val_len: int = Field(ge=0)
-    val_data: bytes
+    @property
+    def map_type(self):
+        return self.type
+
+    def to_dict(self):
+        d = self._json_dict()
+        d["key_data"] = self.key_data.hex()
+        return d
 
-    @model_validator(mode='after')
-    def check_size_matches(self):
-        if len(self.val_data) != self.val_len:
-            raise ValueError(f'val_data length {len(self.val_data)} != val_len {self.val_len}')
-        return self
+    def _json_dict(self):
+        """to_dict() with key_data left as bytes, for dumps to hex-encode."""
+        key_type = self.key_type
+        return {
+            "key_len": self.key_len,
+            "key_type": key_type,
+            "key_type_name": _TYPE_NAMES[self.type][key_type] if key_type < _KEY_TYPE_LIMIT else "UNKNOWN",
+            "key_data": self.key_data,
+            "type": _MAP_TYPE_NAMES[self.type]
+        }
 
     def to_string(self):
-        return json.dumps({
+        return dumps(self._json_dict())
+
+@dataclass(slots=True)
+class PSBTVal:
+    # val_len == len(val_data) is checked by PSBTParser.parse_val.
+    val_len: int
+    val_data: bytes
+
+    def to_dict(self):
+        return {
             "val_len": self.val_len,
             "val_data": self.val_data.hex()
-        }, indent=2)
+        }
+
+    def _json_dict(self):
+        """to_dict() with val_data left as bytes, for dumps to hex-encode."""
+        return {
+            "val_len": self.val_len,
+            "val_data": self.val_data
+        }
+
+    def to_string(self):
+        return dumps(self._json_dict())
 
-class PSBTKeyVal(BaseModel):
+@dataclass(slots=True)
+class PSBTKeyVal:
     key: PSBTKey
     val: PSBTVal
 
+    def to_dict(self):
+        return {
+            "key": self.key.to_dict(),
+            "val": self.val.to_dict()
+        }
+
+    def _json_dict(self):
+        return {
+            "key": self.key._json_dict(),
+            "val": self.val._json_dict()
+        }
+
     def to_string(self):
-        return json.dumps({
-            "key": json.loads(self.key.to_string()),
-            "val": json.loads(self.val.to_string())
-        }, indent=2)
+        return dumps(self._json_dict())
+
+@dataclass(slots=True)
+class PSBTMap:
+    map: tuple[PSBTKeyVal, ...]  # not modified after parsing; parse_map stores a tuple
+    # Index of the first entry for each key_type; built from map if not given
+    by_type: dict[int, int] | None = field(default=None, repr=False, compare=False)
+    # Script bytes this input/output adds to the transaction's base and
+    # witness sizes, used for the v2 vbytes estimate
+    base_size: int = field(default=0, init=False, repr=False, compare=False)
+    witness_size: int = field(default=0, init=False, repr=False, compare=False)
+    is_segwit: bool = field(default=False, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        if self.by_type is None:
+            by_type = {}
+            for i, key_val in enumerate(self.map):
+                by_type.setdefault(key_val.key.key_type, i)
+            self.by_type = by_type
+        if self.map:
+            map_type = self.map[0].key.type
+            if map_type == PSBTMapType.INPUT:
+                witness_script = self._val_len(PSBT_IN_WITNESS_SCRIPT)
+                final_scriptwitness = self._val_len(PSBT_IN_FINAL_SCRIPTWITNESS)
+                self.base_size = self._val_len(PSBT_IN_FINAL_SCRIPTSIG) or 0
+                self.witness_size = (witness_script or 0) + (final_scriptwitness or 0)
+                self.is_segwit = witness_script is not None or final_scriptwitness is not None
+            elif map_type == PSBTMapType.OUTPUT:
+                self.base_size = self._val_len(PSBT_OUT_SCRIPT) or 0
 
-class PSBTMap(BaseModel):
-    map: list[PSBTKeyVal]
+    def get(self, key_type):
+        """Return the value data of the first key of key_type, or None."""
+        i = self.by_type.get(key_type)
+        return None if i is None else self.map[i].val.val_data
+
+    def _val_len(self, key_type):
+        """Return the value length of the first key of key_type, or None."""
+        val_data = self.get(key_type)
+        return None if val_data is None else len(val_data)
+
+    def to_dict(self):
+        return [kv.to_dict() for kv in self.map]
+
+    def _json_dict(self):
+        return [kv._json_dict() for kv in self.map]
 
     def to_string(self):
-        map_list = [json.loads(kv.to_string()) for kv in self.map]
-        return json.dumps(map_list, indent=2)
+        return dumps(self._json_dict())
 
-class PSBT(BaseModel):
-    version: int = Field(ge=0)  # PSBT version must be 0 or 2 (no v1 exists)
+@dataclass(slots=True)
+class PSBT:
+    version: int  # PSBT version must be 0 or 2 (no v1 exists)
     global_map: PSBTMap
     input_maps: list[PSBTMap]
     output_maps: list[PSBTMap]
+    # JSON form built once for to_string()/to_stream(). Assigning a field
+    # clears it; in-place changes to the maps are not tracked.
+    _dict_cache: dict | None = field(default=None, init=False, repr=False, compare=False)
 
-    @field_validator('version')
-    @classmethod
-    def validate_version(cls, v: int) -> int:
-        if v not in (0, 2):
-            raise ValueError(f'PSBT version must be 0 or 2 (v1 does not exist), got {v}')
-        return v
+    def __post_init__(self):
+        if self.version not in (0, 2):
+            raise ValueError(f'PSBT version must be 0 or 2 (v1 does not exist), got {self.version}')
 
-    def to_string(self):
-        return json.dumps({
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name != "_dict_cache":
+            object.__setattr__(self, "_dict_cache", None)
+
+    def to_dict(self):
+        return {
             "version": self.version,
-            "global_map": json.loads(self.global_map.to_string()),
-            "input_maps": [json.loads(input_map.to_string()) for input_map in self.input_maps],
-            "output_maps": [json.loads(output_map.to_string()) for output_map in self.output_maps]
-        }, indent=2)
+            "global_map": self.global_map.to_dict(),
+            "input_maps": [input_map.to_dict() for input_map in self.input_maps],
+            "output_maps": [output_map.to_dict() for output_map in self.output_maps]
+        }
 
+    def _json_dict(self):
+        """to_dict() with raw bytes left for dumps to hex-encode (built once, then reused)."""
+        if self._dict_cache is None:
+            self._dict_cache = {
+                "version": self.version,
+                "global_map": self.global_map._json_dict(),
+                "input_maps": [input_map._json_dict() for input_map in self.input_maps],
+                "output_maps": [output_map._json_dict() for output_map in self.output_maps]
+            }
+        return self._dict_cache
 
-class PSBTInOutInfo(BaseModel):
+    def to_string(self):
+        return dumps(self._json_dict())
+
+    def to_stream(self, fp):
+        """Write the JSON form of to_string() to the text file fp."""
+        dump(self._json_dict(), fp)
+
+
+@dataclass(slots=True)
+class PSBTInOutInfo:
     """Information about a PSBT input or output."""
 
-    amount: int = Field(ge=0)  # Amount in satoshis, must be non-negative
+    amount: int                # Amount in satoshis
     address_type: str          # Type of address (e.g., "P2PKH", "P2WPKH", "P2SH")
     script_type: str           # Type of script (e.g., "legacy", "segwit", "taproot")
 
-    def to_string(self):
-        """Convert to JSON string representation."""
-        return json.dumps({
+    def to_dict(self):
+        """Convert to a plain dict representation."""
+        return {
             "amount": self.amount,
             "address_type": self.address_type,
             "script_type": self.script_type
-        }, indent=2)
+        }
 
+    def to_string(self):
+        """Convert to JSON string representation."""
+        return dumps(self.to_dict())
 
-class PSBTInfo(BaseModel):
+
+@dataclass(slots=True)
+class PSBTInfo:
     """Information extracted from a PSBT."""
 
-    version: int = Field(ge=0)  # PSBT version must be 0 or 2 (no v1 exists)
-    total_input_amt: int = Field(ge=0)
-    total_output_amt: int = Field(ge=0)
-    fee_amt: int = Field(ge=0)
-    fee_rate: float = Field(ge=0)
-    vbytes: float = Field(gt=0)
+    version: int  # PSBT version must be 0 or 2 (no v1 exists)
+    total_input_amt: int
+    total_output_amt: int
+    fee_amt: int
+    fee_rate: float
+    vbytes: float
     change_output: list[bool]
     inputs: list[PSBTInOutInfo]
     outputs: list[PSBTInOutInfo]
+    # to_dict() result kept for to_string(); cleared when a field is assigned
+    _dict_cache: dict | None = field(default=None, init=False, repr=False, compare=False)
 
-    @field_validator('version')
-    @classmethod
-    def validate_version(cls, v: int) -> int:
-        if v not in (0, 2):
-            raise ValueError(f'PSBT version must be 0 or 2 (v1 does not exist), got {v}')
-        return v
+    def __post_init__(self):
+        if self.version not in (0, 2):
+            raise ValueError(f'PSBT version must be 0 or 2 (v1 does not exist), got {self.version}')
 
-    def to_string(self):
-        """Convert to JSON string representation."""
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+        if name != "_dict_cache":
+            object.__setattr__(self, "_dict_cache", None)
+
+    def to_dict(self):
+        """Convert to a plain dict representation (a new dict on every call)."""
         # Convert bool array to string representation
         change_output_str = [str(is_change) for is_change in self.change_output]
 
-        return json.dumps({
+        return {
             "version": self.version,
             "total_input_amt": self.total_input_amt,
             "total_output_amt": self.total_output_amt,
@@ -161,6 +256,12 @@ class PSBTInfo(BaseModel):
             "fee_rate": self.fee_rate,
             "vbytes": self.vbytes,
             "change_output": change_output_str,
-            "inputs": [json.loads(inp.to_string()) for inp in self.inputs],
-            "outputs": [json.loads(out.to_string()) for out in self.outputs]
-        }, indent=2)
+            "inputs": [inp.to_dict() for inp in self.inputs],
+            "outputs": [out.to_dict() for out in self.outputs]
+        }
+
+    def to_string(self):
+        """Convert to JSON string representation (built once, then reused)."""
+        if self._dict_cache is None:
+            self._dict_cache = self.to_dict()
+        return dumps(self._dict_cache)
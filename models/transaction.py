@@ -1,95 +1,116 @@
 """
 Bitcoin transaction data structure classes
 """
-import json
-from pydantic import BaseModel, Field, model_validator
+from models.json_utils import dump, dumps
+from dataclasses import dataclass
 
-class TXWitnessStackItem(BaseModel):
-    stack_item_size: int = Field(ge=0)
+@dataclass(slots=True)
+class TXWitnessStackItem:
+    # stack_item_size == len(stack_item) is checked by
+    # TransactionParser.parse_witness when the item is read.
+    stack_item_size: int
     stack_item: bytes
 
-    @model_validator(mode='after')
-    def check_size_matches(self):
-        if len(self.stack_item) != self.stack_item_size:
-            raise ValueError(f'stack_item length {len(self.stack_item)} != stack_item_size {self.stack_item_size}')
-        return self
-
-    def to_string(self):
-        return json.dumps({
+    def to_dict(self):
+        return {
             "stack_item_size": self.stack_item_size,
             "stack_item": self.stack_item.hex()
-        }, indent=2)
-
-class TXWitnessStack(BaseModel):
-    witness_items: list['TXWitnessStackItem']
+        }
 
     def to_string(self):
-        return json.dumps({
-            "witness_items": [json.loads(item.to_string()) for item in self.witness_items]
-        }, indent=2)
-
-class TXInput(BaseModel):
-    txid: bytes = Field(min_length=32, max_length=32)  # Transaction ID is always 32 bytes
-    vout: bytes = Field(min_length=4, max_length=4)    # Output index is 4 bytes
-    ss_size: int = Field(ge=0)                          # ScriptSig size
-    ss: bytes                                           # ScriptSig
-    seq: bytes = Field(min_length=4, max_length=4)     # Sequence is 4 bytes
-
-    @model_validator(mode='after')
-    def check_size_matches(self):
-        if len(self.ss) != self.ss_size:
-            raise ValueError(f'ss length {len(self.ss)} != ss_size {self.ss_size}')
-        return self
+        return dumps(self.to_dict())
+
+@dataclass(slots=True)
+class TXWitnessStack:
+    witness_items: list[TXWitnessStackItem]
+
+    def to_dict(self):
+        return {
+            "witness_items": [item.to_dict() for item in self.witness_items]
+        }
 
     def to_string(self):
-        return json.dumps({
+        return dumps(self.to_dict())
+
+@dataclass(slots=True)
+class TXInput:
+    # Field sizes and ss_size == len(ss) are checked by
+    # TransactionParser.parse_input when the input is read.
+    txid: bytes     # Transaction ID is always 32 bytes
+    vout: int       # Output index (4 bytes on the wire)
+    ss_size: int    # ScriptSig size
+    ss: bytes       # ScriptSig
+    seq: int        # Sequence (4 bytes on the wire)
+
+    def to_dict(self):
+        return {
             "txid": self.txid.hex(),
-            "vout": self.vout.hex(),
+            "vout": self.vout.to_bytes(4, 'little').hex(),
             "ss_size": self.ss_size,
             "ss": self.ss.hex(),
-            "seq": self.seq.hex()
-        }, indent=2)
+            "seq": self.seq.to_bytes(4, 'little').hex()
+        }
 
-class TXOutput(BaseModel):
-    amount: int = Field(ge=0)       # Amount in satoshis, must be non-negative
-    spk_size: int = Field(ge=0)     # ScriptPubKey size
-    spk: bytes                      # ScriptPubKey
+    def to_string(self):
+        return dumps(self.to_dict())
 
-    @model_validator(mode='after')
-    def check_size_matches(self):
-        if len(self.spk) != self.spk_size:
-            raise ValueError(f'spk length {len(self.spk)} != spk_size {self.spk_size}')
-        return self
+@dataclass(slots=True)
+class TXOutput:
+    # spk_size == len(spk) is checked by TransactionParser.parse_output.
+    amount: int     # Amount in satoshis
+    spk_size: int   # ScriptPubKey size
+    spk: bytes      # ScriptPubKey
 
-    def to_string(self):
-        return json.dumps({
+    def to_dict(self):
+        return {
             "amount": self.amount,
             "spk_size": self.spk_size,
             "spk": self.spk.hex()
-        }, indent=2)
+        }
+
+    def to_string(self):
+        return dumps(self.to_dict())
 
-class Transaction(BaseModel):
-    version: bytes = Field(min_length=4, max_length=4)  # Version is 4 bytes
-    witness_flag: int = Field(ge=0, le=1)                # 0 or 1
+@dataclass(slots=True)
+class Transaction:
+    version: int            # Version (4 bytes on the wire)
+    witness_flag: int       # 0 or 1
     inputs: list[TXInput]
     outputs: list[TXOutput]
-    witness: list                                        # Witness data
-    locktime: bytes = Field(min_length=4, max_length=4)  # Locktime is 4 bytes
-    vbytes: float = Field(gt=0)                          # Virtual bytes, must be positive
+    witness: list           # Witness data: per input, a list of (size, item) tuples
+    locktime: int           # Locktime (4 bytes on the wire)
+    vbytes: float           # Virtual bytes
 
-    def to_string(self):
-        return json.dumps({
-            "version": self.version.hex(),
+    def to_dict(self):
+        return {
+            "version": self.version.to_bytes(4, 'little').hex(),
             "witness_flag": self.witness_flag,
-            "inputs": [json.loads(inp.to_string()) for inp in self.inputs],
-            "outputs": [json.loads(out.to_string()) for out in self.outputs],
-            "witness": self.witness,
-            "locktime": self.locktime.hex(),
+            "inputs": [inp.to_dict() for inp in self.inputs],
+            "outputs": [out.to_dict() for out in self.outputs],
+            "witness": [
+                {"witness_items": [{"stack_item_size": size, "stack_item": item.hex()} for size, item in stack]}
+                for stack in self.witness
+            ],
+            "locktime": self.locktime.to_bytes(4, 'little').hex(),
             "vbytes": self.vbytes
-        }, indent=2)
+        }
+
+    def to_string(self):
+        return dumps(self.to_dict())
+
+    def to_stream(self, fp):
+        """Write the JSON form of to_string() to the text file fp."""
+        dump(self.to_dict(), fp)
 
     def get_input_count(self):
         return len(self.inputs)
 
     def get_output_count(self):
         return len(self.outputs)
+
+    def get_witness_stacks(self):
+        """Return the witness as TXWitnessStack objects, one per input."""
+        return [
+            TXWitnessStack([TXWitnessStackItem(size, item) for size, item in stack])
+            for stack in self.witness
+        ]
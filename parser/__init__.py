@@ -4,11 +4,11 @@ PSBT and transaction parsing functions
 from .psbt_parser import PSBTParser
 from .transaction_parser import TransactionParser
 from .psbt_key_parser import PSBTKeyParser
-from .parser_utils import parse_compact_size, peek_byte, print_bytes
+from .parser_utils import parse_compact_size, read_compact_size, print_bytes
 
 __all__ = [
     'PSBTParser',
     'TransactionParser',
     'PSBTKeyParser',
-    'parse_compact_size', 'peek_byte', 'print_bytes'
+    'parse_compact_size', 'read_compact_size', 'print_bytes'
 ]
@@ -1,6 +1,108 @@
 """
 Utility functions for parsing PSBT data
 """
+import struct
+from binascii import unhexlify
+
+# ASCII whitespace skipped when decoding hex input
+_HEX_WHITESPACE = b' \t\n\r\x0b\x0c'
+
+# Fixed-width little-endian integers
+_U16 = struct.Struct('<H')
+_U32 = struct.Struct('<I')
+_U64 = struct.Struct('<Q')
+
+# Compact size payload reader by prefix byte: None for single-byte values,
+# then 2, 4 and 8 byte integers for the 0xfd, 0xfe and 0xff prefixes
+_COMPACT_SIZE_STRUCT = (None,) * 0xfd + (_U16, _U32, _U64)
+
+class Cursor:
+    """Read cursor over an in-memory byte buffer.
+
+    Holds a memoryview over the source bytes and the read position as an
+    integer offset, so reads slice the original data directly instead of
+    going through BytesIO. Implements read, tell and seek, so a Cursor can
+    be passed anywhere the parsers accept a BytesIO; remaining() replaces
+    the seek-to-end dance of get_remaining_bytes.
+
+    Attributes:
+        buf (memoryview): View over the source bytes.
+        off (int): Offset of the next unread byte.
+    """
+    __slots__ = ('buf', 'off')
+
+    def __init__(self, data, off=0):
+        self.buf = memoryview(data)
+        self.off = off
+
+    def read(self, n=-1):
+        """Read up to n bytes (all remaining bytes if n < 0)."""
+        off = self.off
+        data = self.buf[off:].tobytes() if n < 0 else self.buf[off:off + n].tobytes()
+        self.off = off + len(data)
+        return data
+
+    def read_u32(self):
+        """Read a 4-byte little-endian unsigned integer."""
+        return self._unpack(_U32)
+
+    def read_u64(self):
+        """Read an 8-byte little-endian unsigned integer."""
+        return self._unpack(_U64)
+
+    def _unpack(self, fmt):
+        off = self.off
+        if len(self.buf) - off < fmt.size:
+            raise ValueError(f"Truncated data: {fmt.size} bytes needed, {len(self.buf) - off} left")
+        self.off = off + fmt.size
+        return fmt.unpack_from(self.buf, off)[0]
+
+    def tell(self):
+        """Return the current read offset."""
+        return self.off
+
+    def peek(self):
+        """Return the next byte as an int without consuming it (-1 at end)."""
+        off = self.off
+        return self.buf[off] if off < len(self.buf) else -1
+
+    def remaining(self):
+        """Return the number of unread bytes."""
+        return len(self.buf) - self.off
+
+    def seek(self, off, whence=0):
+        """Move the read offset, with the same whence values as BytesIO.seek."""
+        if whence == 1:
+            off += self.off
+        elif whence == 2:
+            off += len(self.buf)
+        self.off = off
+        return off
+
+def as_cursor(buffer):
+    """Return a Cursor over a buffer, starting at its current position.
+
+    A Cursor is returned unchanged and raw bytes-like data is wrapped from
+    offset 0. A BytesIO is wrapped without copying via getbuffer(), and any
+    other seekable binary file is read whole in one call, so offsets still
+    match the file's; callers should seek() it to the cursor's final offset
+    once parsing is done.
+
+    Args:
+        buffer (Cursor | BytesIO | BinaryIO | bytes | memoryview): Buffer to read from.
+
+    Returns:
+        Cursor: Cursor positioned at the buffer's current offset.
+    """
+    if isinstance(buffer, Cursor):
+        return buffer
+    if isinstance(buffer, (bytes, bytearray, memoryview)):
+        return Cursor(buffer)
+    if hasattr(buffer, 'getbuffer'):
+        return Cursor(buffer.getbuffer(), buffer.tell())
+    start = buffer.tell()
+    buffer.seek(0)
+    return Cursor(buffer.read(), start)
 
 def parse_compact_size(buffer):
     """Parse a Bitcoin compact size (variable-length) integer from a buffer.
@@ -11,47 +113,59 @@ def parse_compact_size(buffer):
     - 0xfe: 1 + 4 bytes (0xfe followed by uint32_le)
     - 0xff: 1 + 8 bytes (0xff followed by uint64_le)
 
+    A Cursor is decoded in place by read_compact_size; any other buffer is
+    wrapped in a Cursor and then seeked past the value.
+
     Args:
-        buffer (BytesIO): Buffer containing compact size data.
+        buffer (Cursor | BytesIO): Buffer containing compact size data.
 
     Returns:
         tuple[int, int]: A tuple of (value, bytes_consumed) where value is
             the parsed integer and bytes_consumed is the total number of
             bytes read from the buffer.
     """
-    byte = buffer.read(1)
-    size = byte[0]
-    if size < 0xfd:
-        return (size, 1)
-    elif size == 0xfd:
-        value_bytes = buffer.read(2)
-        value = int.from_bytes(value_bytes, byteorder='little')
-        return (value, 3)
-    elif size == 0xfe:
-        value_bytes = buffer.read(4)
-        value = int.from_bytes(value_bytes, byteorder='little')
-        return (value, 5)
-    else:
-        value_bytes = buffer.read(8)
-        value = int.from_bytes(value_bytes, byteorder='little')
-        return (value, 9)
-
-def peek_byte(buffer):
-    """Preview the next byte without consuming it from the buffer.
-
-    Reads one byte ahead and then resets the buffer position to its
-    original location, allowing non-destructive lookahead.
+    if type(buffer) is not Cursor:
+        cur = as_cursor(buffer)
+        result = parse_compact_size(cur)
+        buffer.seek(cur.off)
+        return result
+
+    start = buffer.off
+    value = read_compact_size(buffer)
+    return (value, buffer.off - start)
+
+def read_compact_size(cur):
+    """Read a compact size integer from a Cursor and return just its value.
+
+    The hot-path variant of parse_compact_size for callers that do not
+    need the encoded length: the payload reader comes from a table indexed
+    by the prefix byte, so single-byte values take one lookup and wider
+    ones one precompiled struct unpack.
 
     Args:
-        buffer (BytesIO): Buffer to peek into.
+        cur (Cursor): Cursor positioned at the compact size.
 
     Returns:
-        bytes: The next byte in the buffer without advancing the position.
+        int: The decoded value.
+
+    Raises:
+        ValueError: If the cursor ends before the value is complete.
     """
-    current_pos = buffer.tell()
-    next_byte = buffer.read(1)
-    buffer.seek(current_pos)
-    return next_byte
+    buf = cur.buf
+    off = cur.off
+    try:
+        size = buf[off]
+    except IndexError:
+        raise ValueError("Truncated compact size: no bytes left") from None
+    fmt = _COMPACT_SIZE_STRUCT[size]
+    if fmt is None:
+        cur.off = off + 1
+        return size
+    end = off + 1 + fmt.size
+    if end > len(buf):
+        raise ValueError(f"Truncated compact size: {fmt.size} bytes needed, {len(buf) - off - 1} left")
+    cur.off = end
+    return fmt.unpack_from(buf, off + 1)[0]
 
 def print_bytes(bytes):
     """Print bytes as a hexadecimal string.
@@ -65,7 +179,7 @@ def get_remaining_bytes(buffer):
     """Get the number of remaining bytes in a buffer.
 
     Args:
-        buffer (BytesIO): Buffer to check.
+        buffer (Cursor | BytesIO): Buffer to check.
 
     Returns:
         int: Number of bytes remaining from current position to end.
@@ -75,3 +189,36 @@ def get_remaining_bytes(buffer):
     end_pos = buffer.tell()
     buffer.seek(current_pos)  # Seek back to current position
     return end_pos - current_pos
+
+def read_hex(stream, chunk_size=1 << 16):
+    """Decode a hex-encoded stream into bytes, chunk by chunk.
+
+    Whitespace anywhere in the input is ignored. Each chunk is decoded and
+    released before the next one is read, so the full hex text and the
+    decoded bytes never need to be held in memory together. Binary streams
+    are decoded without ever building a str: whitespace is deleted with
+    bytes.translate and the digits go straight to binascii.unhexlify.
+
+    Args:
+        stream (BinaryIO | TextIO): Stream containing hex characters.
+        chunk_size (int): Number of characters to read per chunk.
+
+    Returns:
+        bytearray: The decoded bytes.
+
+    Raises:
+        ValueError: If the stream contains non-hex characters or an odd
+            number of hex digits.
+    """
+    out = bytearray()
+    carry = b''
+    while chunk := stream.read(chunk_size):
+        if isinstance(chunk, str):
+            chunk = chunk.encode('ascii')
+        chunk = carry + chunk.translate(None, _HEX_WHITESPACE)
+        even = len(chunk) & ~1
+        out += unhexlify(chunk[:even])
+        carry = chunk[even:]
+    if carry:
+        raise ValueError("Hex data has an odd number of digits")
+    return out
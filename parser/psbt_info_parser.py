@@ -2,12 +2,37 @@
 PSBT Info Parser - Extract information from PSBT data.
 """
 
-from models.constants import *
+from array import array
+from operator import itemgetter
+from models.constants import OP_0, OP_1, OP_PUSHBYTES_20, OP_PUSHBYTES_32, OP_DUP, OP_EQUAL, OP_EQUALVERIFY, OP_HASH160, OP_CHECKSIG
 from models.constants import PSBT_IN_NON_WITNESS_UTXO, PSBT_IN_WITNESS_UTXO, PSBT_IN_OUTPUT_INDEX, PSBT_OUT_AMOUNT, PSBT_OUT_SCRIPT, PSBT_OUT_BIP32_DERIVATION, PSBT_GLOBAL_UNSIGNED_TX
 from models.psbt import PSBTInOutInfo, PSBTInfo
 from parser.psbt_key_parser import PSBTKeyParser
 from parser.transaction_parser import TransactionParser
 
+# Script template bytes to compare, by scriptPubKey length. Each getter picks
+# the opcode positions of the templates with that length.
+_SCRIPT_SIGNATURE_BYTES = {
+    25: itemgetter(0, 1, 2, 23, 24),
+    23: itemgetter(0, 1, 22),
+    22: itemgetter(0, 1),
+    34: itemgetter(0, 1)
+}
+
+# Script type keyed by (length, *signature bytes)
+_SCRIPT_TEMPLATES = {
+    # P2PKH: OP_DUP OP_HASH160 <20 bytes> OP_EQUALVERIFY OP_CHECKSIG (25 bytes)
+    (25, OP_DUP, OP_HASH160, OP_PUSHBYTES_20, OP_EQUALVERIFY, OP_CHECKSIG): "P2PKH",
+    # P2SH: OP_HASH160 <20 bytes> OP_EQUAL (23 bytes)
+    (23, OP_HASH160, OP_PUSHBYTES_20, OP_EQUAL): "P2SH",
+    # P2WPKH: OP_0 <20 bytes> (22 bytes)
+    (22, OP_0, OP_PUSHBYTES_20): "P2WPKH",
+    # P2WSH: OP_0 <32 bytes> (34 bytes)
+    (34, OP_0, OP_PUSHBYTES_32): "P2WSH",
+    # P2TR: OP_1 <32 bytes> (34 bytes)
+    (34, OP_1, OP_PUSHBYTES_32): "P2TR"
+}
+
 class PSBTInfoParser:
     """Parser for extracting information from PSBTs."""
 
@@ -32,10 +57,7 @@ class PSBTInfoParser:
         Returns:
             int: Index of the key if found, -1 otherwise
         """
-        for i, key_val in enumerate(input_map.map):
-            if key_val.key.key_type == key_type:
-                return i
-        return -1
+        return input_map.by_type.get(key_type, -1)
 
     @staticmethod
     def get_vbytes_v2(input_map_list: list, output_map_list: list) -> float:
@@ -48,46 +70,25 @@ class PSBTInfoParser:
         Returns:
             float: Virtual size in vbytes
         """
-        witness_size = 0
-        is_segwit = False
-
         # Base size is the size of the transaction without witness data
         base_size = 4 # version
         base_size += 1 # input count (estimate)
         base_size += 1 # output count (estimate)
         base_size += 4 # locktime
 
-        # Calculate base (and, optionally, witness size) for inputs
-        for input_map in input_map_list:
-            base_size += 32 # txid
-            base_size += 4 # vout
-            base_size += 1 # script size (estimate)
-            base_size += 4 # sequence number
-
-            # Iterate through key-value pairs in this input map
-            for key_val in input_map.map:
-                if key_val.key.key_type == PSBT_IN_WITNESS_SCRIPT:
-                    witness_size += len(key_val.val.val_data)
-                    is_segwit = True
-                elif key_val.key.key_type == PSBT_IN_FINAL_SCRIPTSIG:
-                    base_size += len(key_val.val.val_data)
-                elif key_val.key.key_type == PSBT_IN_FINAL_SCRIPTWITNESS:
-                    witness_size += len(key_val.val.val_data)
-                    is_segwit = True
-
-        # If SegWit, add witness size to base size
-        if is_segwit:
-            base_size += 2 # witness flag
+        # Fixed per-input size: txid (32) + vout (4) + script size estimate (1) + sequence (4)
+        base_size += 41 * len(input_map_list)
+        # Script sizes were summed per map when it was built
+        base_size += sum(input_map.base_size for input_map in input_map_list)
+        witness_size = sum(input_map.witness_size for input_map in input_map_list)
 
-        # Calculate base size for outputs
-        for output_map in output_map_list:
-            base_size += 8 # amount
-            base_size += 1 # script size (estimate)
+        # If SegWit, add witness flag to base size
+        if any(input_map.is_segwit for input_map in input_map_list):
+            base_size += 2 # witness flag
 
-            # Iterate through key-value pairs in this output map
-            for key_val in output_map.map:
-                if key_val.key.key_type == PSBT_OUT_SCRIPT:
-                    base_size += len(key_val.val.val_data)
+        # Fixed per-output size: amount (8) + script size estimate (1), plus the script
+        base_size += 9 * len(output_map_list)
+        base_size += sum(output_map.base_size for output_map in output_map_list)
 
         # Calculate weight and vbytes
         weight = (base_size * 4) + witness_size
@@ -107,37 +108,10 @@ class PSBTInfoParser:
             str: Script type (e.g., "P2PKH", "P2WPKH", "P2SH", "P2WSH", "P2TR")
         """
         script_len = len(script)
-
-        # P2PKH: OP_DUP OP_HASH160 <20 bytes> OP_EQUALVERIFY OP_CHECKSIG (25 bytes)
-        if script_len == 25 \
-            and script[0] == OP_DUP and script[1] == OP_HASH160 and script[2] == OP_PUSHBYTES_20 \
-            and script[23] == OP_EQUALVERIFY and script[24] == OP_CHECKSIG:
-                return "P2PKH"
-
-        # P2SH: OP_HASH160 <20 bytes> OP_EQUAL (23 bytes)
-        if script_len == 23 \
-            and script[0] == OP_HASH160 and script[1] == OP_PUSHBYTES_20 \
-            and script[22] == OP_EQUAL:
-                return "P2SH"
-
-        # P2WPKH: OP_0 <20 bytes> (22 bytes)
-        if script_len == 22 \
-            and script[0] == OP_0 \
-            and script[1] == OP_PUSHBYTES_20:
-                return "P2WPKH"
-
-        # P2WSH: OP_0 <32 bytes> (34 bytes)
-        if script_len == 34 \
-            and script[0] == OP_0 \
-            and script[1] == OP_PUSHBYTES_32:
-                return "P2WSH"
-
-        # P2TR: OP_1 <32 bytes> (34 bytes)
-        if script_len == 34 \
-            and script[0] == OP_1 and script[1] == OP_PUSHBYTES_32:
-                return "P2TR"
-
-        return "UNKNOWN"
+        getter = _SCRIPT_SIGNATURE_BYTES.get(script_len)
+        if getter is None:
+            return "UNKNOWN"
+        return _SCRIPT_TEMPLATES.get((script_len, *getter(script)), "UNKNOWN")
 
     @staticmethod
     def get_info(psbt):
@@ -151,82 +125,101 @@ class PSBTInfoParser:
             dict: Information about the PSBT
         """
 
+        # Bind class-level lookups used in the loops below to locals
+        determine_script_type = PSBTInfoParser.determine_script_type
+        address_type_for = PSBTInfoParser.SCRIPT_TYPE_TO_ADDRESS_TYPE.get
+        parse_output_index = PSBTKeyParser.parse_key_PSBT_IN_OUTPUT_INDEX
+        parse_output_at = TransactionParser.parse_output_at
+        parse_witness_utxo = PSBTKeyParser.parse_key_PSBT_IN_WITNESS_UTXO
+        parse_out_amount = PSBTKeyParser.parse_key_PSBT_OUT_AMOUNT
+        parse_out_script = PSBTKeyParser.parse_key_PSBT_OUT_SCRIPT
+        parse_bip32_derivation = PSBTKeyParser.parse_key_PSBT_OUT_BIP32_DERIVATION
+
         # get global map data as transaction
         if psbt.version == 0:
-            from io import BytesIO
-            key_index = PSBTInfoParser.find_key_index(psbt.global_map, PSBT_GLOBAL_UNSIGNED_TX)
-            tx_data = psbt.global_map.map[key_index].val.val_data
-            this_tx = TransactionParser.parse_transaction(BytesIO(tx_data))
+            tx_data = psbt.global_map.get(PSBT_GLOBAL_UNSIGNED_TX)
+            this_tx = TransactionParser.parse_transaction(tx_data)
 
         # Get Inputs (Same for v0 and v2)
         input_list = []
+        input_amounts = array('Q') # amounts kept contiguous for the fee totals
         for i in range(len(psbt.input_maps)):
             input_map = psbt.input_maps[i]
 
-            non_witness_utxo_index = PSBTInfoParser.find_key_index(input_map, PSBT_IN_NON_WITNESS_UTXO)
-            witness_utxo_index = PSBTInfoParser.find_key_index(input_map, PSBT_IN_WITNESS_UTXO)
+            non_witness_utxo = input_map.get(PSBT_IN_NON_WITNESS_UTXO)
+            witness_utxo_data = input_map.get(PSBT_IN_WITNESS_UTXO)
 
             # get output index from input transaction (method differs for v0 and v2)
             if psbt.version == 0:
-                output_index = int.from_bytes(this_tx.inputs[i].vout, 'little')
+                output_index = this_tx.inputs[i].vout
             else:
-                output_index_key = PSBTInfoParser.find_key_index(input_map, PSBT_IN_OUTPUT_INDEX)
-                output_index = PSBTKeyParser.parse_key_PSBT_IN_OUTPUT_INDEX(input_map.map[output_index_key].val.val_data)
-
-            if non_witness_utxo_index != -1:
-                # parse non-witness UTXO
-                input_tx = PSBTKeyParser.parse_key_PSBT_IN_NON_WITNESS_UTXO(input_map.map[non_witness_utxo_index].val.val_data)
+                output_index_data = input_map.get(PSBT_IN_OUTPUT_INDEX)
+                if output_index_data is None:
+                    raise ValueError("No output index found for input " + str(i))
+                output_index = parse_output_index(output_index_data)
+
+            if non_witness_utxo is not None:
+                # parse only the spent output of the non-witness UTXO transaction
+                spent_output = parse_output_at(non_witness_utxo, output_index)
                 # get amount from input transaction
-                amount = input_tx.outputs[output_index].amount
+                amount = spent_output.amount
                 # get script for determining type
-                script = input_tx.outputs[output_index].spk
-            elif witness_utxo_index != -1:
+                script = spent_output.spk
+            elif witness_utxo_data is not None:
                 # parse witness UTXO
-                witness_utxo = PSBTKeyParser.parse_key_PSBT_IN_WITNESS_UTXO(input_map.map[witness_utxo_index].val.val_data)
+                witness_utxo = parse_witness_utxo(witness_utxo_data)
                 # get amount from witness UTXO
                 amount = witness_utxo.amount
-                # get script from witness UTXO (need to convert from hex)
-                script = bytes.fromhex(witness_utxo.script_hash)
+                # get script from witness UTXO
+                script = witness_utxo.script_hash
             else:
                 raise ValueError("No UTXO found for input " + str(i))
 
             # determine script type
-            script_type = PSBTInfoParser.determine_script_type(script)
+            script_type = determine_script_type(script)
             # determine address type
-            address_type = PSBTInfoParser.SCRIPT_TYPE_TO_ADDRESS_TYPE.get(script_type, "Unknown")
+            address_type = address_type_for(script_type, "Unknown")
 
             # add to input list
             input_list.append(PSBTInOutInfo(amount=amount, address_type=address_type, script_type=script_type))
+            input_amounts.append(amount)
 
         # Get Outputs (Different for v0 and v2)
         output_list = []
+        output_amounts = array('Q')
         if psbt.version == 0:
             for i in range(len(this_tx.outputs)):
                 # get amount from output transaction
                 amount = this_tx.outputs[i].amount
                 # determine script type
-                script_type = PSBTInfoParser.determine_script_type(this_tx.outputs[i].spk)
+                script_type = determine_script_type(this_tx.outputs[i].spk)
                 # determine address type
-                address_type = PSBTInfoParser.SCRIPT_TYPE_TO_ADDRESS_TYPE.get(script_type, "Unknown")
+                address_type = address_type_for(script_type, "Unknown")
                 # add to output list
                 output_list.append(PSBTInOutInfo(amount=amount, address_type=address_type, script_type=script_type))
+                output_amounts.append(amount)
         else:
             for i in range(len(psbt.output_maps)):
                 output_map = psbt.output_maps[i]
                 # get amount from output map
-                amount_key = PSBTInfoParser.find_key_index(output_map, PSBT_OUT_AMOUNT)
-                amount = PSBTKeyParser.parse_key_PSBT_OUT_AMOUNT(output_map.map[amount_key].val.val_data)
+                amount_data = output_map.get(PSBT_OUT_AMOUNT)
+                if amount_data is None:
+                    raise ValueError("No amount found for output " + str(i))
+                amount = parse_out_amount(amount_data)
                 # determine script type
-                script_key = PSBTInfoParser.find_key_index(output_map, PSBT_OUT_SCRIPT)
-                script_type = PSBTInfoParser.determine_script_type(PSBTKeyParser.parse_key_PSBT_OUT_SCRIPT(output_map.map[script_key].val.val_data))
+                script_data = output_map.get(PSBT_OUT_SCRIPT)
+                if script_data is None:
+                    raise ValueError("No script found for output " + str(i))
+                script_type = determine_script_type(parse_out_script(script_data))
                 # determine address type
-                address_type = PSBTInfoParser.SCRIPT_TYPE_TO_ADDRESS_TYPE.get(script_type, "Unknown")
+                address_type = address_type_for(script_type, "Unknown")
                 # add to output list
                 output_list.append(PSBTInOutInfo(amount=amount, address_type=address_type, script_type=script_type))
+                output_amounts.append(amount)
 
         # Calculate fee
-        input_total = sum(input.amount for input in input_list)
-        output_total = sum(output.amount for output in output_list)
+        input_total = sum(input_amounts)
+        output_total = sum(output_amounts)
         fee = input_total - output_total
 
         # Calculate fee rate
@@ -241,9 +234,9 @@ class PSBTInfoParser:
         for i in range(len(psbt.output_maps)):
             output_map = psbt.output_maps[i]
             # Look for BIP32 derivation path in this output
-            deriv_index = PSBTInfoParser.find_key_index(output_map, PSBT_OUT_BIP32_DERIVATION)
-            if deriv_index != -1:
-                derivation = PSBTKeyParser.parse_key_PSBT_OUT_BIP32_DERIVATION(output_map.map[deriv_index].val.val_data)
+            deriv_data = output_map.get(PSBT_OUT_BIP32_DERIVATION)
+            if deriv_data is not None:
+                derivation = parse_bip32_derivation(deriv_data)
                 change_output[i] = derivation.is_change
 
         return PSBTInfo(version=psbt.version, total_input_amt=input_total, total_output_amt=output_total, fee_amt=fee, fee_rate=fee_rate, vbytes=vbytes, change_output=change_output, inputs=input_list, outputs=output_list)
\ No newline at end of file
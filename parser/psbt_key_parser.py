@@ -2,13 +2,15 @@
 PSBT Key Parser - Parse and extract data from PSBT keys.
 """
 
-from io import BytesIO
+import struct
 from models.keys import PsbtKeyInWitnessUTXO, PsbtKeyOutBIP32Derivation
+from parser.parser_utils import Cursor, read_compact_size
 from parser.transaction_parser import TransactionParser
 
-# Bitcoin Script OP codes
-OP_0 = bytes([0])
-OP_PUSHBYTES_20 = bytes([20])
+# Fixed-width little-endian readers
+_U32 = struct.Struct('<I').unpack_from
+_U64 = struct.Struct('<Q').unpack_from
+_BIP32_PATH = struct.Struct('<4s5I').unpack_from   # fingerprint, 5 indices
 
 
 class PSBTKeyParser:
@@ -25,21 +27,23 @@ class PSBTKeyParser:
         Returns:
             PsbtKeyInWitnessUTXO: Parsed witness UTXO information
         """
-        from parser.parser_utils import parse_compact_size
-        buffer = BytesIO(data)
+        cur = Cursor(data, 8)
 
         # retrieve UTXO amount in sats (8 bytes)
-        amount = buffer.read(8)
+        try:
+            (amount,) = _U64(data, 0)
+        except struct.error:
+            raise ValueError(f"Witness UTXO too short for amount: {len(data)} bytes") from None
 
         # read script length as compact size
-        script_len, _ = parse_compact_size(buffer)
+        script_len = read_compact_size(cur)
 
         # retrieve scriptPubKey
-        script = buffer.read(script_len)
+        script = cur.read(script_len)
 
         return PsbtKeyInWitnessUTXO(
-            amount = int.from_bytes(amount, "little"),
-            script_hash = script.hex()
+            amount = amount,
+            script_hash = script
         )
 
     @staticmethod
@@ -53,28 +57,16 @@ class PSBTKeyParser:
         Returns:
             PsbtKeyOutBIP32Derivation: Parsed BIP32 derivation information
         """
-        buffer = BytesIO(data)
+        # Shorter derivation paths read their missing indices as 0
+        if len(data) < 24:
+            data = bytes(data).ljust(24, b'\x00')
 
-        # Read 4-byte fingerprint
-        fingerprint = buffer.read(4)
+        # Read 4-byte fingerprint and 5 derivation path indices in one unpack
+        fingerprint, *path = _BIP32_PATH(data, 0)
 
-        # Parse 5 derivation path indices
-        indices = []
-        hardened = []
-
-        for _ in range(5):
-            # Read 4 bytes for each index
-            index_bytes = buffer.read(4)
-            index_value = int.from_bytes(index_bytes, "little")
-
-            # Check if hardened using bitwise AND with 0x80000000
-            is_hardened = (index_value & 0x80000000) != 0
-
-            # Get the actual index value (mask off the hardened bit)
-            actual_index = index_value & 0x7FFFFFFF
-
-            indices.append(actual_index)
-            hardened.append(is_hardened)
+        # Mask off the hardened bit (0x80000000) and record it separately
+        indices = [index_value & 0x7FFFFFFF for index_value in path]
+        hardened = [(index_value & 0x80000000) != 0 for index_value in path]
 
         return PsbtKeyOutBIP32Derivation(
             fingerprint = fingerprint.hex(),
@@ -94,8 +86,7 @@ class PSBTKeyParser:
         Returns:
             Transaction: Parsed transaction object
         """
-        buffer = BytesIO(data)
-        return TransactionParser.parse_transaction(buffer)
+        return TransactionParser.parse_transaction(data)
 
     @staticmethod
     def parse_key_PSBT_IN_PREVIOUS_TXID(data: bytes):
@@ -121,7 +112,10 @@ class PSBTKeyParser:
         Returns:
             int: Output index
         """
-        return int.from_bytes(data, "little")
+        try:
+            return _U32(data, 0)[0]
+        except struct.error:
+            raise ValueError(f"Output index must be 4 bytes, got {len(data)}") from None
 
     @staticmethod
     def parse_key_PSBT_OUT_AMOUNT(data: bytes):
@@ -134,7 +128,10 @@ class PSBTKeyParser:
         Returns:
             int: Amount in satoshis
         """
-        return int.from_bytes(data, "little")
+        try:
+            return _U64(data, 0)[0]
+        except struct.error:
+            raise ValueError(f"Amount must be 8 bytes, got {len(data)}") from None
 
     @staticmethod
     def parse_key_PSBT_OUT_SCRIPT(data: bytes):
@@ -1,11 +1,13 @@
 """
 PSBT parsing functions
 """
-from io import BytesIO
 from models.psbt import *
 from models.constants import PSBT_GLOBAL_UNSIGNED_TX, PSBT_GLOBAL_INPUT_COUNT, PSBT_GLOBAL_OUTPUT_COUNT, PSBT_GLOBAL_TX_VERSION
 from .transaction_parser import TransactionParser
-from .parser_utils import parse_compact_size, peek_byte
+from .parser_utils import Cursor, as_cursor, parse_compact_size, read_compact_size
+
+# Magic bytes b'psbt' followed by the 0xff separator
+PSBT_HEADER = b'psbt\xff'
 
 class PSBTParser:
     """Parser for Partially Signed Bitcoin Transactions."""
@@ -19,7 +21,7 @@ class PSBTParser:
         to BIP-174 and BIP-370 specifications.
 
         Args:
-            buffer (BytesIO): Buffer containing raw PSBT data.
+            buffer (Cursor | BytesIO | bytes): Buffer containing raw PSBT data.
 
         Returns:
             PSBT: A parsed PSBT object containing version, global map,
@@ -29,51 +31,50 @@ class PSBTParser:
             ValueError: If magic bytes are invalid, separator is invalid,
                 or PSBT version cannot be determined.
         """
-        # Parse and validate magic bytes and separator
-        magic_bytes = buffer.read(4)
-        separator = buffer.read(1)
-        if magic_bytes != b'psbt':
-            raise ValueError(f"Invalid magic bytes: {magic_bytes.hex()}")
-        if separator != b'\xff':
-            raise ValueError(f"Invalid separator: {separator.hex()}")
+        cur = as_cursor(buffer)
+
+        # Parse and validate magic bytes and separator in one comparison;
+        # only a bad header is split up to name the part that is wrong
+        header = cur.read(5)
+        if header != PSBT_HEADER:
+            if header[:4] != b'psbt':
+                raise ValueError(f"Invalid magic bytes: {header[:4].hex()}")
+            raise ValueError(f"Invalid separator: {header[4:].hex()}")
 
         # Parse global map
-        global_map = PSBTParser.parse_map(buffer, PSBTMapType.GLOBAL)
+        global_map = PSBTParser.parse_map(cur, PSBTMapType.GLOBAL)
 
         # Determine PSBT version
-        psbt_version = -1
-        for key_val in global_map.map:
-            if key_val.key.key_type == PSBT_GLOBAL_UNSIGNED_TX:
-                psbt_version = 0
-                break
-            if key_val.key.key_type == PSBT_GLOBAL_TX_VERSION:
-                psbt_version = 2
-                break
-        if psbt_version == -1:
+        by_type = global_map.by_type
+        if PSBT_GLOBAL_UNSIGNED_TX in by_type:
+            psbt_version = 0
+        elif PSBT_GLOBAL_TX_VERSION in by_type:
+            psbt_version = 2
+        else:
             raise ValueError("PSBT version could not be determined; global map parsed incorrectly")
 
         # Determine number of inputs and outputs
-        if psbt_version == PSBT_GLOBAL_UNSIGNED_TX: # parse transaction to determine input and output counts
+        if psbt_version == 0: # parse transaction to determine input and output counts
             # Parse transaction
-            transaction_buffer = BytesIO(global_map.map[0].val.val_data)
-            transaction = TransactionParser.parse_transaction(transaction_buffer)
+            transaction = TransactionParser.parse_transaction(global_map.get(PSBT_GLOBAL_UNSIGNED_TX))
             input_ct = transaction.get_input_count()
             output_ct = transaction.get_output_count()
-        else: # search for type keys 04 and 05 in global map, which are input and output counts, respectively
-            # Initialize with 0 for creator-stage PSBTs that may not have counts yet
+        else: # look up type keys 04 and 05 in global map, which are input and output counts, respectively
+            # Default to 0 for creator-stage PSBTs that may not have counts yet
             input_ct = 0
             output_ct = 0
-            for key_val in global_map.map:
-                if key_val.key.key_type == PSBT_GLOBAL_INPUT_COUNT:
-                    input_ct, _ = parse_compact_size(BytesIO(key_val.val.val_data))
-                if key_val.key.key_type == PSBT_GLOBAL_OUTPUT_COUNT:
-                    output_ct, _ = parse_compact_size(BytesIO(key_val.val.val_data))
+            if PSBT_GLOBAL_INPUT_COUNT in by_type:
+                input_ct = read_compact_size(Cursor(global_map.get(PSBT_GLOBAL_INPUT_COUNT)))
+            if PSBT_GLOBAL_OUTPUT_COUNT in by_type:
+                output_ct = read_compact_size(Cursor(global_map.get(PSBT_GLOBAL_OUTPUT_COUNT)))
 
         # Parse input maps
-        input_maps = [PSBTParser.parse_map(buffer, PSBTMapType.INPUT) for _ in range(input_ct)]
+        input_maps = [PSBTParser.parse_map(cur, PSBTMapType.INPUT) for _ in range(input_ct)]
 
         # Parse output maps
-        output_maps = [PSBTParser.parse_map(buffer, PSBTMapType.OUTPUT) for _ in range(output_ct)]
+        output_maps = [PSBTParser.parse_map(cur, PSBTMapType.OUTPUT) for _ in range(output_ct)]
+        if cur is not buffer and hasattr(buffer, 'seek'):
+            buffer.seek(cur.off)
 
         return PSBT(version=psbt_version, global_map=global_map, input_maps=input_maps, output_maps=output_maps)
 
@@ -86,32 +87,85 @@ class PSBTParser:
         in PSBT format.
 
         Args:
-            buffer (BytesIO): Buffer containing PSBT map data.
+            buffer (Cursor | BytesIO | bytes): Buffer containing PSBT map data.
             map_type (PSBTMapType): Type of the map (GLOBAL, INPUT, or OUTPUT).
 
         Returns:
             PSBTMap: A map object containing the parsed key-value pairs.
+
+        Raises:
+            ValueError: If the buffer ends before the 0x00 terminator, or a
+                key or value is truncated.
         """
+        cur = as_cursor(buffer)
+        buf = cur.buf
+        end = len(buf)
+        off = cur.off
         map = []
-        while peek_byte(buffer) != b'\x00':
-            key_val = PSBTParser.parse_key_val(buffer, map_type)
-            map.append(key_val)
-        buffer.read(1) # consume the 0x00 byte
-        return PSBTMap(map=map)
+        append = map.append
+        by_type = {} # index of the first key-value pair for each key type
+        # parse_key and parse_val are inlined here, since this loop runs once
+        # per key-value pair in the PSBT; keep their checks in sync. Lengths
+        # and key types below 0xfd are decoded from their single byte, and
+        # only the wider encodings go through read_compact_size. Empty key
+        # data and values skip the memoryview slice and reuse b''
+        while off < end and buf[off]:
+            key_len = buf[off]
+            if key_len < 0xfd:
+                off += 1
+            else:
+                cur.off = off
+                key_len = read_compact_size(cur)
+                off = cur.off
+            if off < end and buf[off] < 0xfd:
+                key_type = buf[off]
+                key_data = buf[off + 1:off + key_len].tobytes() if key_len > 1 else b''
+                off += 1 + len(key_data)
+                if len(key_data) + 1 != key_len:
+                    raise ValueError(f"key_len {key_len} != len(key_data) + key_type_len ({len(key_data) + 1})")
+            else:
+                cur.off = off
+                key_type, key_type_len = parse_compact_size(cur)
+                key_data = cur.read(key_len - key_type_len)
+                off = cur.off
+                if len(key_data) + key_type_len != key_len:
+                    raise ValueError(f"key_len {key_len} != len(key_data) + key_type_len ({len(key_data) + key_type_len})")
+            if off < end and buf[off] < 0xfd:
+                val_len = buf[off]
+                off += 1
+            else:
+                cur.off = off
+                val_len = read_compact_size(cur)
+                off = cur.off
+            val_data = buf[off:off + val_len].tobytes() if val_len else b''
+            off += len(val_data)
+            if len(val_data) != val_len:
+                raise ValueError(f"val_data length {len(val_data)} != val_len {val_len}")
+            by_type.setdefault(key_type, len(map))
+            append(PSBTKeyVal(PSBTKey(key_len, key_type, key_data, map_type), PSBTVal(val_len, val_data)))
+        if off >= end:
+            raise ValueError("PSBT map ended without a 0x00 terminator")
+        cur.off = off + 1 # consume the 0x00 byte
+        if cur is not buffer and hasattr(buffer, 'seek'):
+            buffer.seek(cur.off)
+        return PSBTMap(map=tuple(map), by_type=by_type)
 
     @staticmethod
     def parse_key_val(buffer, map_type: PSBTMapType):
         """Parse a single PSBT key-value pair from a buffer.
 
         Args:
-            buffer (BytesIO): Buffer containing key-value pair data.
+            buffer (Cursor | BytesIO | bytes): Buffer containing key-value pair data.
             map_type (PSBTMapType): Type of the map (GLOBAL, INPUT, or OUTPUT).
 
         Returns:
             PSBTKeyVal: A key-value pair object containing the parsed key and value.
         """
-        key = PSBTParser.parse_key(buffer, map_type)
-        val = PSBTParser.parse_val(buffer)
+        cur = as_cursor(buffer)
+        key = PSBTParser.parse_key(cur, map_type)
+        val = PSBTParser.parse_val(cur)
+        if cur is not buffer and hasattr(buffer, 'seek'):
+            buffer.seek(cur.off)
         return PSBTKeyVal(key=key, val=val)
 
     @staticmethod
@@ -122,15 +176,23 @@ class PSBTParser:
         any additional key data.
 
         Args:
-            buffer (BytesIO): Buffer containing key data.
+            buffer (Cursor | BytesIO | bytes): Buffer containing key data.
             map_type (PSBTMapType): Type of the map (GLOBAL, INPUT, or OUTPUT).
 
         Returns:
             PSBTKey: A key object containing length, type, and data fields.
+
+        Raises:
+            ValueError: If the buffer ends before key_len bytes are read.
         """
-        key_len, _ = parse_compact_size(buffer)
-        key_type, key_type_len = parse_compact_size(buffer)
-        key_data = buffer.read(key_len - key_type_len)
+        cur = as_cursor(buffer)
+        key_len = read_compact_size(cur)
+        key_type, key_type_len = parse_compact_size(cur)
+        key_data = cur.read(key_len - key_type_len)
+        if cur is not buffer and hasattr(buffer, 'seek'):
+            buffer.seek(cur.off)
+        if len(key_data) + key_type_len != key_len:
+            raise ValueError(f"key_len {key_len} != len(key_data) + key_type_len ({len(key_data) + key_type_len})")
         return PSBTKey(key_len=key_len, key_type=key_type, key_data=key_data, type=map_type)
 
     @staticmethod
@@ -140,12 +202,20 @@ class PSBTParser:
         Reads the value length as a compact size, then the value data.
 
         Args:
-            buffer (BytesIO): Buffer containing value data.
+            buffer (Cursor | BytesIO | bytes): Buffer containing value data.
 
         Returns:
             PSBTVal: A value object containing length and data fields.
+
+        Raises:
+            ValueError: If the buffer ends before val_len bytes are read.
         """
-        val_len, _ = parse_compact_size(buffer)
-        val_data = buffer.read(val_len)
+        cur = as_cursor(buffer)
+        val_len = read_compact_size(cur)
+        val_data = cur.read(val_len) if val_len else b''
+        if cur is not buffer and hasattr(buffer, 'seek'):
+            buffer.seek(cur.off)
+        if len(val_data) != val_len:
+            raise ValueError(f"val_data length {len(val_data)} != val_len {val_len}")
         return PSBTVal(val_len=val_len, val_data=val_data)
 
@@ -1,9 +1,19 @@
 """
 Bitcoin transaction parsing functions
 """
-from models.transaction import Transaction, TXInput, TXOutput, TXWitnessStack, TXWitnessStackItem
-from .parser_utils import parse_compact_size, peek_byte, get_remaining_bytes
+import struct
+from models.transaction import Transaction, TXInput, TXOutput
+from .parser_utils import as_cursor, read_compact_size
 
+# Fixed-size field layouts, unpacked straight from the cursor's view
+_INPUT_PREFIX = struct.Struct('<32sI')    # txid, vout
+_INPUT_SUFFIX = struct.Struct('<I')       # sequence
+_OUTPUT_PREFIX = struct.Struct('<Q')      # amount in satoshis
+# A whole input with an empty scriptSig: txid, vout, 0x00, sequence
+_BARE_INPUT = struct.Struct('<32sIxI')
+# Input count 1, one bare input and the output count: the head of the
+# common one-input, one- or two-output payment shapes
+_ONE_IN_HEAD = struct.Struct('<B32sIxIB')
 
 class TransactionParser:
     """Parser for Bitcoin transactions."""
@@ -17,47 +27,111 @@ class TransactionParser:
         witness data accordingly.
 
         Args:
-            buffer (BytesIO): Buffer containing raw transaction data.
+            buffer (Cursor | BytesIO | bytes): Buffer containing raw transaction data.
 
         Returns:
             Transaction: A parsed transaction object with version, inputs,
                 outputs, witness data (if SegWit), and locktime.
+
+        Raises:
+            ValueError: If the buffer ends before the transaction is complete.
         """
-        # Get the size of the transaction data
-        tx_size = len(buffer.getvalue())
+        cur = as_cursor(buffer)
+        start = cur.off
 
-        version = buffer.read(4)
+        version = cur.read_u32()
         is_segwit = False
         witness_flag = 0
 
-        # Check if transaction is SegWit
-        if peek_byte(buffer) == b'\x00': # segwit transaction
-            is_segwit = True
-            marker = buffer.read(1) # consume the 0x00 marker byte
-            witness_flag = int.from_bytes(buffer.read(1), byteorder='little') # consume the 0x01 flag byte
+        # Check if transaction is SegWit: a 0x00 marker followed by a nonzero
+        # flag. A 0x00 0x00 pair is a legacy transaction with no inputs.
+        buf = cur.buf
+        off = cur.off
+        if off < len(buf) and buf[off] == 0:
+            if off + 1 >= len(buf):
+                raise ValueError("Truncated transaction: missing witness flag")
+            if buf[off + 1]: # segwit transaction
+                witness_flag = buf[off + 1] # the 0x01 flag byte, read as an int
+                if witness_flag > 1:
+                    raise ValueError(f"Invalid witness flag: {witness_flag}")
+                is_segwit = True
+                cur.off = off + 2 # skip the marker and flag bytes
 
-        # Parse inputs and outputs
-        input_ct, _ = parse_compact_size(buffer)
-        inputs = [TransactionParser.parse_input(buffer) for _ in range(input_ct)]
-        output_ct, _ = parse_compact_size(buffer)
-        outputs = [TransactionParser.parse_output(buffer) for _ in range(output_ct)]
+        # Parse inputs and outputs, trying the common shape first
+        shaped = TransactionParser._parse_one_input(cur)
+        if shaped is not None:
+            input_ct = 1
+            inputs, outputs = shaped
+        else:
+            input_ct = read_compact_size(cur)
+            inputs = TransactionParser.parse_inputs(cur, input_ct)
+            output_ct = read_compact_size(cur)
+            outputs = TransactionParser.parse_outputs(cur, output_ct)
 
         # Parse witness data (if present)
         witness_stacks = []
         witness_size = 0
         if is_segwit:
-            witness_size = get_remaining_bytes(buffer) - 4  # Minus 4 bytes for locktime
-            witness_stacks.append(TransactionParser.parse_witness(buffer, input_ct))
+            witness_start = cur.off
+            witness_stacks = TransactionParser.parse_witness(cur, input_ct)
+            witness_size = cur.off - witness_start
 
         # Read locktime
-        locktime = buffer.read(4)
+        locktime = cur.read_u32()
+        if cur is not buffer and hasattr(buffer, 'seek'):
+            buffer.seek(cur.off)
+
+        # Size of the transaction data, from the offsets consumed (no copy)
+        tx_size = cur.off - start
+        # Stripped size: without the marker, flag and witness data (BIP 141)
+        base_size = tx_size - witness_size - 2 if is_segwit else tx_size
 
         # Calculate weight and vbytes
-        weight = (tx_size * 4) + witness_size
+        weight = (base_size * 3) + tx_size
         vbytes = weight / 4
 
         return Transaction(version=version, witness_flag=witness_flag, inputs=inputs, outputs=outputs, witness=witness_stacks, locktime=locktime, vbytes=vbytes)
 
+    @staticmethod
+    def _parse_one_input(cur):
+        """Parse the inputs and outputs of a one-input, one- or two-output transaction.
+
+        Most payments spend one input with an empty scriptSig (always the
+        case for a PSBT's unsigned transaction) to a recipient, plus a
+        change output unless the wallet is swept. That shape is read with
+        one struct unpack and unrolled outputs, with no per-record calls.
+
+        Args:
+            cur (Cursor): Cursor positioned at the input count.
+
+        Returns:
+            tuple[list[TXInput], list[TXOutput]] | None: The inputs and
+                outputs, or None (with the cursor unmoved) if the data does
+                not have this shape.
+        """
+        buf = cur.buf
+        off = cur.off
+        end_of_buf = len(buf)
+        head_end = off + _ONE_IN_HEAD.size
+        if head_end > end_of_buf or buf[off] != 1 or buf[off + 37] != 0 or not 1 <= buf[head_end - 1] <= 2:
+            return None
+        _, txid, vout, seq, output_ct = _ONE_IN_HEAD.unpack_from(buf, off)
+        unpack_amount = _OUTPUT_PREFIX.unpack_from
+        off = head_end
+        outputs = []
+        for _ in range(output_ct):
+            if end_of_buf - off < 9 or buf[off + 8] >= 0xfd:
+                return None
+            (amount,) = unpack_amount(buf, off)
+            spk_size = buf[off + 8]
+            end = off + 9 + spk_size
+            if end > end_of_buf:
+                return None
+            outputs.append(TXOutput(amount, spk_size, buf[off + 9:end].tobytes()))
+            off = end
+        cur.off = off
+        return [TXInput(txid, vout, 0, b'', seq)], outputs
+
     @staticmethod
     def parse_input(buffer):
         """Parse a single transaction input from a buffer.
@@ -66,19 +140,101 @@ class TransactionParser:
         and sequence number.
 
         Args:
-            buffer (BytesIO): Buffer containing transaction input data.
+            buffer (Cursor | BytesIO | bytes): Buffer containing transaction input data.
 
         Returns:
             TXInput: A transaction input object with txid, vout, scriptSig,
                 and sequence fields.
+
+        Raises:
+            ValueError: If the buffer ends before the input is complete.
         """
-        txid = buffer.read(32)
-        vout = buffer.read(4)
-        ss_size, _ = parse_compact_size(buffer)
-        ss = buffer.read(ss_size)
-        seq = buffer.read(4)
+        cur = as_cursor(buffer)
+        if cur.remaining() < _INPUT_PREFIX.size:
+            raise ValueError(f"Truncated input: {cur.remaining()} bytes left for txid and vout")
+        txid, vout = _INPUT_PREFIX.unpack_from(cur.buf, cur.off)
+        cur.off += _INPUT_PREFIX.size
+        ss_size = read_compact_size(cur)
+        ss = cur.read(ss_size)
+        if len(ss) != ss_size:
+            raise ValueError(f"ss length {len(ss)} != ss_size {ss_size}")
+        if cur.remaining() < _INPUT_SUFFIX.size:
+            raise ValueError(f"Truncated input: {cur.remaining()} bytes left for sequence")
+        (seq,) = _INPUT_SUFFIX.unpack_from(cur.buf, cur.off)
+        cur.off += _INPUT_SUFFIX.size
+        if cur is not buffer and hasattr(buffer, 'seek'):
+            buffer.seek(cur.off)
         return TXInput(txid=txid, vout=vout, ss_size=ss_size, ss=ss, seq=seq)
 
+    @staticmethod
+    def parse_inputs(buffer, input_count):
+        """Parse a run of consecutive transaction inputs from a buffer.
+
+        Equivalent to calling parse_input input_count times, but walks the
+        buffer with local offsets in a single loop, so there is no per-input
+        call, cursor wrap or seek. Single-byte scriptSig sizes are decoded
+        inline, and a run where every scriptSig is empty is unpacked as
+        fixed-size records.
+
+        Args:
+            buffer (Cursor | BytesIO | bytes): Buffer positioned at the first input.
+            input_count (int): Number of inputs to read.
+
+        Returns:
+            list[TXInput]: The parsed inputs, in order.
+
+        Raises:
+            ValueError: If the buffer ends before the last input is complete.
+        """
+        cur = as_cursor(buffer)
+        buf = cur.buf
+        end_of_buf = len(buf)
+        off = cur.off
+
+        # SegWit spends usually have empty scriptSigs, which makes the inputs
+        # fixed-size records: check every scriptSig size byte, then unpack
+        # the whole run in one pass.
+        stride = _BARE_INPUT.size
+        run_end = off + stride * input_count
+        if input_count and run_end <= end_of_buf and not any(buf[off + 36:run_end:stride]):
+            inputs = [TXInput(txid, vout, 0, b'', seq)
+                      for txid, vout, seq in _BARE_INPUT.iter_unpack(buf[off:run_end])]
+            cur.off = run_end
+            if cur is not buffer and hasattr(buffer, 'seek'):
+                buffer.seek(run_end)
+            return inputs
+
+        unpack_prefix = _INPUT_PREFIX.unpack_from
+        unpack_suffix = _INPUT_SUFFIX.unpack_from
+        inputs = []
+        append = inputs.append
+        for _ in range(input_count):
+            if end_of_buf - off < 36:
+                raise ValueError(f"Truncated input: {end_of_buf - off} bytes left for txid and vout")
+            txid, vout = unpack_prefix(buf, off)
+            off += 36
+            if off < end_of_buf and buf[off] < 0xfd:
+                ss_size = buf[off]
+                off += 1
+            else:
+                cur.off = off
+                ss_size = read_compact_size(cur)
+                off = cur.off
+            end = off + ss_size
+            if end > end_of_buf:
+                raise ValueError(f"ss length {end_of_buf - off} != ss_size {ss_size}")
+            ss = buf[off:end].tobytes()
+            off = end
+            if end_of_buf - off < 4:
+                raise ValueError(f"Truncated input: {end_of_buf - off} bytes left for sequence")
+            (seq,) = unpack_suffix(buf, off)
+            off += 4
+            append(TXInput(txid, vout, ss_size, ss, seq))
+        cur.off = off
+        if cur is not buffer and hasattr(buffer, 'seek'):
+            buffer.seek(off)
+        return inputs
+
     @staticmethod
     def parse_output(buffer):
         """Parse a single transaction output from a buffer.
@@ -86,18 +242,119 @@ class TransactionParser:
         Reads the output amount in satoshis and the scriptPubKey.
 
         Args:
-            buffer (BytesIO): Buffer containing transaction output data.
+            buffer (Cursor | BytesIO | bytes): Buffer containing transaction output data.
 
         Returns:
             TXOutput: A transaction output object with amount and
                 scriptPubKey fields.
+
+        Raises:
+            ValueError: If the buffer ends before the output is complete.
         """
-        amount_bytes = buffer.read(8)
-        amount = int.from_bytes(amount_bytes, byteorder='little')
-        spk_size, _ = parse_compact_size(buffer)
-        spk = buffer.read(spk_size)
+        cur = as_cursor(buffer)
+        if cur.remaining() < _OUTPUT_PREFIX.size:
+            raise ValueError(f"Truncated output: {cur.remaining()} bytes left for amount")
+        (amount,) = _OUTPUT_PREFIX.unpack_from(cur.buf, cur.off)
+        cur.off += _OUTPUT_PREFIX.size
+        spk_size = read_compact_size(cur)
+        spk = cur.read(spk_size)
+        if cur is not buffer and hasattr(buffer, 'seek'):
+            buffer.seek(cur.off)
+        if len(spk) != spk_size:
+            raise ValueError(f"spk length {len(spk)} != spk_size {spk_size}")
         return TXOutput(amount=amount, spk_size=spk_size, spk=spk)
 
+    @staticmethod
+    def parse_outputs(buffer, output_count):
+        """Parse a run of consecutive transaction outputs from a buffer.
+
+        Equivalent to calling parse_output output_count times, walking the
+        buffer with local offsets in a single loop like parse_inputs.
+
+        Args:
+            buffer (Cursor | BytesIO | bytes): Buffer positioned at the first output.
+            output_count (int): Number of outputs to read.
+
+        Returns:
+            list[TXOutput]: The parsed outputs, in order.
+
+        Raises:
+            ValueError: If the buffer ends before the last output is complete.
+        """
+        cur = as_cursor(buffer)
+        buf = cur.buf
+        end_of_buf = len(buf)
+        off = cur.off
+        unpack_amount = _OUTPUT_PREFIX.unpack_from
+        outputs = []
+        append = outputs.append
+        for _ in range(output_count):
+            if end_of_buf - off < 8:
+                raise ValueError(f"Truncated output: {end_of_buf - off} bytes left for amount")
+            (amount,) = unpack_amount(buf, off)
+            off += 8
+            if off < end_of_buf and buf[off] < 0xfd:
+                spk_size = buf[off]
+                off += 1
+            else:
+                cur.off = off
+                spk_size = read_compact_size(cur)
+                off = cur.off
+            end = off + spk_size
+            if end > end_of_buf:
+                raise ValueError(f"spk length {end_of_buf - off} != spk_size {spk_size}")
+            append(TXOutput(amount, spk_size, buf[off:end].tobytes()))
+            off = end
+        cur.off = off
+        if cur is not buffer and hasattr(buffer, 'seek'):
+            buffer.seek(off)
+        return outputs
+
+    @staticmethod
+    def parse_output_at(buffer, index):
+        """Parse only the output at a given index from a raw transaction.
+
+        Skips over the version, SegWit marker, and inputs, then skips the
+        outputs before index without building any objects. Use this when
+        only one output of a transaction is needed (e.g. the spent output
+        of a non-witness UTXO).
+
+        Args:
+            buffer (Cursor | BytesIO | bytes): Buffer containing raw transaction data.
+            index (int): Index of the output to parse.
+
+        Returns:
+            TXOutput: The output at the given index.
+
+        Raises:
+            ValueError: If index is out of range or the buffer is truncated.
+        """
+        cur = as_cursor(buffer)
+        cur.off += 4 # version
+        if cur.peek() == 0 and cur.off + 1 < len(cur.buf) and cur.buf[cur.off + 1]: # segwit marker and flag
+            cur.off += 2
+
+        # Skip inputs: txid (32) + vout (4), scriptSig, sequence (4)
+        input_ct = read_compact_size(cur)
+        for _ in range(input_ct):
+            cur.off += 36
+            ss_size = read_compact_size(cur)
+            cur.off += ss_size + 4
+
+        # Skip outputs before index: amount (8), scriptPubKey
+        output_ct = read_compact_size(cur)
+        if not 0 <= index < output_ct:
+            raise ValueError(f"Output index {index} out of range for {output_ct} outputs")
+        for _ in range(index):
+            cur.off += 8
+            spk_size = read_compact_size(cur)
+            cur.off += spk_size
+
+        output = TransactionParser.parse_output(cur)
+        if cur is not buffer and hasattr(buffer, 'seek'):
+            buffer.seek(cur.off)
+        return output
+
     @staticmethod
     def parse_witness(buffer, input_count):
         """Parse witness data for a SegWit transaction.
@@ -106,21 +363,41 @@ class TransactionParser:
         Each witness stack contains a variable number of stack items.
 
         Args:
-            buffer (BytesIO): Buffer containing witness data.
+            buffer (Cursor | BytesIO | bytes): Buffer containing witness data.
             input_count (int): Number of inputs in the transaction.
 
         Returns:
-            list[TXWitnessStack]: List of witness stacks, one per input.
+            list[list[tuple[int, bytes]]]: One stack per input, each a list
+                of (stack_item_size, stack_item) tuples.
+
+        Raises:
+            ValueError: If the buffer ends before a stack item is complete.
         """
+        cur = as_cursor(buffer)
+        buf = cur.buf
+        end_of_buf = len(buf)
         witness_stacks = []
-        for i in range(input_count):
-            stack_item_count, _ = parse_compact_size(buffer)
+        for _ in range(input_count):
+            stack_item_count = read_compact_size(cur)
             stack_items = []
-            for j in range(stack_item_count):
-                stack_item_size, _ = parse_compact_size(buffer)
-                stack_item_data = buffer.read(stack_item_size)
-                stack_item = TXWitnessStackItem(stack_item_size=stack_item_size, stack_item=stack_item_data)
-                stack_items.append(stack_item)
-            witness_stack = TXWitnessStack(witness_items=stack_items)
-            witness_stacks.append(witness_stack)
+            append = stack_items.append
+            off = cur.off
+            for _ in range(stack_item_count):
+                # Item sizes below 0xfd are a single byte; decode those inline
+                if off < end_of_buf and buf[off] < 0xfd:
+                    stack_item_size = buf[off]
+                    off += 1
+                else:
+                    cur.off = off
+                    stack_item_size = read_compact_size(cur)
+                    off = cur.off
+                end = off + stack_item_size
+                if end > end_of_buf:
+                    raise ValueError(f"stack_item length {end_of_buf - off} != stack_item_size {stack_item_size}")
+                append((stack_item_size, buf[off:end].tobytes()))
+                off = end
+            cur.off = off
+            witness_stacks.append(stack_items)
+        if cur is not buffer and hasattr(buffer, 'seek'):
+            buffer.seek(cur.off)
         return witness_stacks
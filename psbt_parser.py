@@ -2,53 +2,113 @@
 """
 PSBT Parser - Parse and display Bitcoin Partially Signed Bitcoin Transactions
 """
+import os
 import sys
-import json
-from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import Pool
 from parser.psbt_parser import PSBTParser
+from parser.parser_utils import Cursor, read_hex
 from parser.psbt_info_parser import PSBTInfoParser
 from api.mempool import MempoolAPI
 from psbt_report import PSBTReport
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python psbt_parser.py <filename>", file=sys.stderr)
-        sys.exit(1)
 
-    # Read PSBT from file and load into buffer
-    filename = sys.argv[1]
+def analyze_file(filename):
+    """
+    Read, parse and analyze one PSBT file.
+
+    Args:
+        filename: Path to a binary (.psbt) or hex-encoded PSBT file
+
+    Returns:
+        tuple: (version, input count, output count, PSBTInfo), where the
+            PSBTInfo is None for an early-stage PSBT without UTXO data
+    """
     if filename.endswith('.psbt'):
         # Binary PSBT file
         with open(filename, 'rb') as f:
             byte_data = f.read()
     else:
         # Hex-encoded PSBT file (.txt or other)
-        with open(filename, 'r') as f:
-            hex_string = f.read().strip()
-        byte_data = bytes.fromhex(hex_string)
-    buffer = BytesIO(byte_data)
+        with open(filename, 'rb') as f:
+            byte_data = read_hex(f)
 
-    # Parse PSBT
-    psbt = PSBTParser.parse_psbt(buffer)
+    # Parse PSBT directly over the decoded bytes
+    psbt = PSBTParser.parse_psbt(Cursor(byte_data))
 
     # Parse PSBT info
     try:
         psbt_info = PSBTInfoParser.get_info(psbt)
     except ValueError as e:
-        if "No UTXO found" in str(e):
-            # Early-stage PSBT without UTXO data
-            print("\nNote: This PSBT is at an early stage (creator/constructor) and lacks")
-            print("      UTXO data needed for amount and fee analysis.")
-            print(f"\nPSBT Version: {psbt.version}")
-            print(f"Inputs: {len(psbt.input_maps)}")
-            print(f"Outputs: {len(psbt.output_maps)}")
-            sys.exit(0)
-        else:
+        if "No UTXO found" not in str(e):
             raise
+        # Early-stage PSBT without UTXO data
+        psbt_info = None
+    return psbt.version, len(psbt.input_maps), len(psbt.output_maps), psbt_info
+
+
+def _analyze_file_or_error(filename):
+    """Pool worker: analyze a file, returning the error message instead of raising.
+
+    Any exception is caught so one malformed PSBT cannot abort the batch.
+    """
+    try:
+        return analyze_file(filename), None
+    except (OSError, ValueError) as e:
+        return None, str(e)
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}"
+
 
-    # Get recommended fee rates from mempool
-    mempool = MempoolAPI()
-    recommended_fee_rates = mempool.get_recommendeed_fee_rates()
+def print_result(result, recommended_fee_rates):
+    """Print the summary for one analyze_file result."""
+    version, input_ct, output_ct, psbt_info = result
+    if psbt_info is None:
+        print("\nNote: This PSBT is at an early stage (creator/constructor) and lacks")
+        print("      UTXO data needed for amount and fee analysis.")
+        print(f"\nPSBT Version: {version}")
+        print(f"Inputs: {input_ct}")
+        print(f"Outputs: {output_ct}")
+    else:
+        PSBTReport.print_summary(psbt_info, recommended_fee_rates)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Usage: python psbt_parser.py <filename> [<filename> ...]", file=sys.stderr)
+        sys.exit(1)
+    filenames = sys.argv[1:]
+
+    # Several files are parsed in worker processes. The pool is started
+    # before the fee thread so no thread is running when it forks.
+    pool = None
+    if len(filenames) > 1:
+        pool = Pool(min(os.cpu_count() or 1, len(filenames)))
+
+    # Fetch recommended fee rates from mempool in the background while parsing
+    fee_executor = ThreadPoolExecutor(max_workers=1)
+    fee_future = fee_executor.submit(MempoolAPI().get_recommendeed_fee_rates)
+
+    if pool is None:
+        result = analyze_file(filenames[0])
+        recommended_fee_rates = fee_future.result() if result[3] is not None else None
+        print_result(result, recommended_fee_rates)
+    else:
+        failed = False
+        with pool:
+            results = pool.imap(_analyze_file_or_error, filenames)
+            recommended_fee_rates = None
+            for filename, (result, error) in zip(filenames, results):
+                print(f"\n==> {filename} <==")
+                if error is not None:
+                    print(f"Error: {error}", file=sys.stderr)
+                    failed = True
+                    continue
+                if recommended_fee_rates is None and result[3] is not None:
+                    recommended_fee_rates = fee_future.result()
+                print_result(result, recommended_fee_rates)
+        if failed:
+            fee_executor.shutdown()
+            sys.exit(1)
 
-    # Print human-readable summary
-    PSBTReport.print_summary(psbt_info, recommended_fee_rates)
+    fee_executor.shutdown()
@@ -1,81 +1,125 @@
 """
 PSBT Report - Format and display PSBT information in human-readable format
 """
+import sys
+from bisect import bisect_right
+from itertools import accumulate
+from math import inf, nextafter
+
+RULE = "=" * 60
+
+# mempool.space recommended fee keys, slowest to fastest; missing rates
+# default to 1 sat/vB, and all five at 1 means the mempool is empty
+FEE_RATE_KEYS = ("minimumFee", "economyFee", "hourFee", "halfHourFee", "fastestFee")
+EMPTY_MEMPOOL_RATES = (1,) * len(FEE_RATE_KEYS)
+
+# Fee assessments, one per band of PSBTReport.assess_fee_rate's limits,
+# plus a final entry for rates above every limit
+FEE_ASSESSMENTS = (
+    "Fee rate is too low",
+    "Transaction could take several hours to days to confirm",
+    "Transaction could take more than an hour to confirm",
+    "Transaction should confirm between 30 minutes and an hour",
+    "Transaction should take less than 30 minutes to confirm",
+    "Transaction should confirm in less than 10 minutes",
+    "Fee rate is high but tolerable",
+    "Fee rate is excessive/wasteful"
+)
 
 class PSBTReport:
     """Formatter for displaying PSBT information."""
 
+    @staticmethod
+    def assess_fee_rate(fee_rate, minimum_fee, economy_fee, hour_fee, half_hour_fee, fastest_fee):
+        """
+        Describe how quickly a fee rate should confirm.
+
+        The rate is placed among the recommended rates by binary search.
+        The limits are made non-decreasing with a running max first, which
+        picks the same band as checking "fee_rate < limit" in order even
+        if the recommended rates are out of order.
+
+        Args:
+            fee_rate: Transaction fee rate in sat/vB
+            minimum_fee, economy_fee, hour_fee, half_hour_fee, fastest_fee:
+                Recommended fee rates in sat/vB
+
+        Returns:
+            str: One of FEE_ASSESSMENTS
+        """
+        limits = (
+            minimum_fee, economy_fee, hour_fee, half_hour_fee, fastest_fee,
+            nextafter(1.5 * fastest_fee, inf),  # up to and including 1.5x fastest
+            3 * fastest_fee
+        )
+        return FEE_ASSESSMENTS[bisect_right(list(accumulate(limits, max)), fee_rate)]
+
     @staticmethod
     def print_summary(psbt_info, recommended_fee_rates=None):
         """
         Print a human-readable summary of a PSBT.
 
+        The report is assembled as a list of lines and written to stdout
+        in a single call.
+
         Args:
             psbt_info: PSBTInfo object with parsed transaction details
             recommended_fee_rates: Optional dict of recommended fee rates from mempool API
         """
-        print("\n" + "="*60)
-        print("PSBT SUMMARY")
-        print("="*60)
+        lines = ["", RULE, "PSBT SUMMARY", RULE]
 
         # PSBT Version
-        print(f"\nPSBT Version: {psbt_info.version}")
+        lines.append(f"\nPSBT Version: {psbt_info.version}")
 
         # Input breakdown
-        print(f"\nInputs ({len(psbt_info.inputs)}):")
-        for i, input_info in enumerate(psbt_info.inputs):
-            print(f"  [{i}] {input_info.amount:,} sats | {input_info.address_type} | {input_info.script_type}")
+        inputs = psbt_info.inputs
+        lines.append(f"\nInputs ({len(inputs)}):")
+        lines.extend(
+            f"  [{i}] {input_info.amount:,} sats | {input_info.address_type} | {input_info.script_type}"
+            for i, input_info in enumerate(inputs)
+        )
 
         # Output breakdown
-        print(f"\nOutputs ({len(psbt_info.outputs)}):")
-        for i, output_info in enumerate(psbt_info.outputs):
-            change_marker = " (change output)" if psbt_info.change_output[i] else ""
-            print(f"  [{i}] {output_info.amount:,} sats | {output_info.address_type} | {output_info.script_type}{change_marker}")
+        outputs = psbt_info.outputs
+        lines.append(f"\nOutputs ({len(outputs)}):")
+        lines.extend(
+            f"  [{i}] {output_info.amount:,} sats | {output_info.address_type} | {output_info.script_type}"
+            f"{' (change output)' if is_change else ''}"
+            for i, (output_info, is_change) in enumerate(zip(outputs, psbt_info.change_output))
+        )
 
         # Transaction Summary with fee assessment
-        print(f"\nTransaction Summary:")
-        print(f"  Total Input:      {psbt_info.total_input_amt:,} sats")
-        print(f"  Total Output:     {psbt_info.total_output_amt:,} sats")
-        print(f"  Transaction Size: ~{psbt_info.vbytes} vB")
-        print(f"  Fee:              {psbt_info.fee_amt:,} sats")
-        print(f"  Fee Rate:         ~{round(psbt_info.fee_rate)} sat/vB")
+        fee_rate = psbt_info.fee_rate
+        lines.append(f"\nTransaction Summary:")
+        lines.append(f"  Total Input:      {psbt_info.total_input_amt:,} sats")
+        lines.append(f"  Total Output:     {psbt_info.total_output_amt:,} sats")
+        lines.append(f"  Transaction Size: ~{psbt_info.vbytes} vB")
+        lines.append(f"  Fee:              {psbt_info.fee_amt:,} sats")
+        lines.append(f"  Fee Rate:         ~{round(fee_rate)} sat/vB")
 
         # Display recommended fee rates and fee assessment
         if recommended_fee_rates:
-            minimum_fee = recommended_fee_rates.get("minimumFee", 1)
-            economy_fee = recommended_fee_rates.get("economyFee", 1)
-            hour_fee = recommended_fee_rates.get("hourFee", 1)
-            half_hour_fee = recommended_fee_rates.get("halfHourFee", 1)
-            fastest_fee = recommended_fee_rates.get("fastestFee", 1)
-
-            if minimum_fee == economy_fee == hour_fee == half_hour_fee == fastest_fee == 1:
-                print("  Assessment:       Mempool is empty - transaction should confirm in next block regardless of fee")
-                if psbt_info.fee_rate > 2:
-                    print("                    Note: Supplied fee is excessive for current mempool conditions")
-            elif psbt_info.fee_rate < minimum_fee:
-                print("  Assessment:       Fee rate is too low")
-            elif psbt_info.fee_rate < economy_fee:
-                print("  Assessment:       Transaction could take several hours to days to confirm")
-            elif psbt_info.fee_rate < hour_fee:
-                print("  Assessment:       Transaction could take more than an hour to confirm")
-            elif psbt_info.fee_rate < half_hour_fee:
-                print("  Assessment:       Transaction should confirm between 30 minutes and an hour")
-            elif psbt_info.fee_rate < fastest_fee:
-                print("  Assessment:       Transaction should take less than 30 minutes to confirm")
-            elif psbt_info.fee_rate <= 1.5 * fastest_fee:
-                print("  Assessment:       Transaction should confirm in less than 10 minutes")
-            elif psbt_info.fee_rate < 3 * fastest_fee:
-                print("  Assessment:       Fee rate is high but tolerable")
+            get_rate = recommended_fee_rates.get
+            rates = tuple(get_rate(key, 1) for key in FEE_RATE_KEYS)
+            minimum_fee, economy_fee, hour_fee, half_hour_fee, fastest_fee = rates
+
+            if rates == EMPTY_MEMPOOL_RATES:
+                lines.append("  Assessment:       Mempool is empty - transaction should confirm in next block regardless of fee")
+                if fee_rate > 2:
+                    lines.append("                    Note: Supplied fee is excessive for current mempool conditions")
             else:
-                print("  Assessment:       Fee rate is excessive/wasteful")
+                assessment = PSBTReport.assess_fee_rate(fee_rate, *rates)
+                lines.append(f"  Assessment:       {assessment}")
+
+            lines.append(f"\nRecommended Fee Rates (mempool.space):")
+            lines.append(f"  Fastest (<10 min):  {fastest_fee} sat/vB")
+            lines.append(f"  Half Hour:          {half_hour_fee} sat/vB")
+            lines.append(f"  One Hour:           {hour_fee} sat/vB")
+            lines.append(f"  Economy:            {economy_fee} sat/vB")
+            lines.append(f"  Minimum:            {minimum_fee} sat/vB")
         else:
-            print("  Assessment:       Could not fetch recommended fee rates from mempool API")
+            lines.append("  Assessment:       Could not fetch recommended fee rates from mempool API")
 
-        print(f"\nRecommended Fee Rates (mempool.space):")
-        print(f"  Fastest (<10 min):  {fastest_fee} sat/vB")
-        print(f"  Half Hour:          {half_hour_fee} sat/vB")
-        print(f"  One Hour:           {hour_fee} sat/vB")
-        print(f"  Economy:            {economy_fee} sat/vB")
-        print(f"  Minimum:            {minimum_fee} sat/vB")
+        lines.append("\n" + RULE + "\n")
 
-        print("\n" + "="*60 + "\n")
+        sys.stdout.write("\n".join(lines) + "\n")
@@ -2,8 +2,93 @@
 Unit tests for parser/parser_utils.py
 """
 import pytest
-from io import BytesIO
-from parser.parser_utils import parse_compact_size, peek_byte, get_remaining_bytes, print_bytes
+from io import BytesIO, StringIO
+from parser.parser_utils import Cursor, as_cursor, parse_compact_size, read_compact_size, get_remaining_bytes, print_bytes, read_hex
+
+
+class TestCursor:
+    """Test Cursor class and as_cursor function"""
+
+    def test_cursor_read_advances(self):
+        """Test that reads return bytes and advance the offset"""
+        cur = Cursor(b'\x01\x02\x03\x04')
+        assert cur.read(2) == b'\x01\x02'
+        assert cur.tell() == 2
+        assert cur.read(2) == b'\x03\x04'
+        assert cur.tell() == 4
+
+    def test_cursor_read_past_end(self):
+        """Test that reading past the end returns the remaining bytes"""
+        cur = Cursor(b'\xaa\xbb')
+        assert cur.read(5) == b'\xaa\xbb'
+        assert cur.read(1) == b''
+        assert cur.tell() == 2
+
+    def test_cursor_read_all(self):
+        """Test that a negative size reads all remaining bytes"""
+        cur = Cursor(b'\x01\x02\x03', 1)
+        assert cur.read() == b'\x02\x03'
+
+    def test_cursor_read_fixed_width(self):
+        """Test reading little-endian u32 and u64 values"""
+        cur = Cursor((7).to_bytes(4, 'little') + (2**64 - 1).to_bytes(8, 'little'))
+        assert cur.read_u32() == 7
+        assert cur.read_u64() == 2**64 - 1
+        assert cur.remaining() == 0
+
+    def test_cursor_read_fixed_width_truncated(self):
+        """Test that a short fixed-width read raises ValueError and does not advance"""
+        cur = Cursor(b'\x01\x02\x03')
+        with pytest.raises(ValueError, match="Truncated data"):
+            cur.read_u32()
+        assert cur.tell() == 0
+
+    def test_cursor_seek(self):
+        """Test seeking from start, current position and end"""
+        cur = Cursor(b'\x00' * 10)
+        assert cur.seek(4) == 4
+        assert cur.seek(2, 1) == 6
+        assert cur.seek(-3, 2) == 7
+
+    def test_cursor_peek(self):
+        """Test peeking the next byte as an int without consuming it"""
+        cur = Cursor(b'\x00\xff')
+        assert cur.peek() == 0
+        assert cur.peek() == 0
+        cur.read(1)
+        assert cur.peek() == 0xff
+        cur.read(1)
+        assert cur.peek() == -1
+
+    def test_cursor_remaining(self):
+        """Test counting unread bytes"""
+        cur = Cursor(b'\x01\x02\x03')
+        assert cur.remaining() == 3
+        cur.read(2)
+        assert cur.remaining() == 1
+
+    def test_as_cursor_returns_cursor_unchanged(self):
+        """Test that an existing Cursor is passed through"""
+        cur = Cursor(b'\x01')
+        assert as_cursor(cur) is cur
+
+    def test_as_cursor_wraps_bytesio_at_position(self):
+        """Test that a BytesIO is wrapped at its current position"""
+        buffer = BytesIO(b'\x01\x02\x03')
+        buffer.read(1)
+        cur = as_cursor(buffer)
+        assert cur.tell() == 1
+        assert cur.read(1) == b'\x02'
+
+    def test_as_cursor_reads_file_at_position(self, tmp_path):
+        """Test that a binary file is read once and wrapped at its position"""
+        path = tmp_path / "data.bin"
+        path.write_bytes(b'\x01\x02\x03')
+        with open(path, 'rb') as f:
+            f.read(1)
+            cur = as_cursor(f)
+        assert cur.tell() == 1
+        assert cur.read(1) == b'\x02'
 
 
 class TestParseCompactSize:
@@ -87,54 +172,43 @@ class TestParseCompactSize:
         # Next bytes should be 0xaa
         assert buffer.read(1) == b'\xaa'
 
-
-class TestPeekByte:
-    """Test peek_byte function"""
-
-    def test_peek_byte_single(self):
-        """Test peeking at a single byte"""
-        buffer = BytesIO(b'\x42')
-        peeked = peek_byte(buffer)
-        assert peeked == b'\x42'
-        # Verify position hasn't changed
-        assert buffer.tell() == 0
-
-    def test_peek_byte_multiple_calls(self):
-        """Test that multiple peeks return the same byte"""
-        buffer = BytesIO(b'\xff\xaa\xbb')
-        peek1 = peek_byte(buffer)
-        peek2 = peek_byte(buffer)
-        peek3 = peek_byte(buffer)
-        assert peek1 == peek2 == peek3 == b'\xff'
-        assert buffer.tell() == 0
-
-    def test_peek_byte_after_read(self):
-        """Test peeking after reading from buffer"""
-        buffer = BytesIO(b'\x01\x02\x03')
-        buffer.read(1)  # Consume first byte
-        peeked = peek_byte(buffer)
-        assert peeked == b'\x02'
-        assert buffer.tell() == 1
-        # Verify next read gets the same byte
-        assert buffer.read(1) == b'\x02'
-
-    def test_peek_byte_preserves_position(self):
-        """Test that peek doesn't affect subsequent reads"""
-        buffer = BytesIO(b'\xaa\xbb\xcc')
-        buffer.read(1)  # Position at 1
-        peek_byte(buffer)
-        peek_byte(buffer)
-        # Next read should still get 0xbb
-        assert buffer.read(1) == b'\xbb'
-        assert buffer.tell() == 2
-
-    def test_peek_byte_at_end(self):
-        """Test peeking at end of buffer"""
-        buffer = BytesIO(b'\x01')
-        buffer.read(1)  # Move to end
-        peeked = peek_byte(buffer)
-        assert peeked == b''
-        assert buffer.tell() == 1
+    def test_cursor_each_width(self):
+        """Test compact size parsing from a Cursor for every prefix width"""
+        cur = Cursor(b'\x05' + b'\xfd\x00\x01' + b'\xfe\x01\x00\x00\x00' + b'\xff' + (2**40).to_bytes(8, 'little'))
+        assert parse_compact_size(cur) == (5, 1)
+        assert parse_compact_size(cur) == (256, 3)
+        assert parse_compact_size(cur) == (1, 5)
+        assert parse_compact_size(cur) == (2**40, 9)
+        assert cur.remaining() == 0
+
+
+class TestReadCompactSize:
+    """Test read_compact_size function"""
+
+    @pytest.mark.parametrize("data, value", [
+        (b'\x00', 0),
+        (b'\xfc', 252),
+        (b'\xfd\xfd\x00', 253),
+        (b'\xfe\x00\x00\x01\x00', 65536),
+        (b'\xff' + (2**32).to_bytes(8, 'little'), 2**32),
+    ])
+    def test_read_compact_size_values(self, data, value):
+        """Test that each prefix width decodes and advances the cursor"""
+        cur = Cursor(data + b'\xaa')
+        assert read_compact_size(cur) == value
+        assert cur.tell() == len(data)
+
+    def test_read_compact_size_empty(self):
+        """Test that an exhausted cursor raises ValueError"""
+        with pytest.raises(ValueError, match="Truncated compact size"):
+            read_compact_size(Cursor(b''))
+
+    def test_read_compact_size_truncated_payload(self):
+        """Test that a prefix without its full payload raises ValueError"""
+        cur = Cursor(b'\xfe\x01\x02')
+        with pytest.raises(ValueError, match="Truncated compact size"):
+            read_compact_size(cur)
+        assert cur.tell() == 0
 
 
 class TestGetRemainingBytes:
@@ -217,3 +291,37 @@ class TestPrintBytes:
         print_bytes(test_bytes)
         captured = capsys.readouterr()
         assert captured.out.strip() == '42'
+
+
+class TestReadHex:
+    """Test read_hex function"""
+
+    def test_read_hex_simple(self):
+        """Test decoding a short hex string"""
+        assert read_hex(StringIO('70736274ff')) == b'psbt\xff'
+
+    def test_read_hex_odd_chunk_boundary(self):
+        """Test decoding when chunks split a byte in half"""
+        assert read_hex(StringIO('0a1b2c3d4e'), chunk_size=3) == b'\x0a\x1b\x2c\x3d\x4e'
+
+    def test_read_hex_ignores_whitespace(self):
+        """Test that whitespace and newlines are skipped"""
+        assert read_hex(StringIO(' 0a 1\nb2c\n'), chunk_size=2) == b'\x0a\x1b\x2c'
+
+    def test_read_hex_binary_stream(self):
+        """Test decoding a binary stream with whitespace across chunks"""
+        assert read_hex(BytesIO(b'0a1\r\nb 2c'), chunk_size=3) == b'\x0a\x1b\x2c'
+
+    def test_read_hex_empty(self):
+        """Test decoding empty input"""
+        assert read_hex(StringIO('')) == b''
+
+    def test_read_hex_odd_length(self):
+        """Test that an odd number of hex digits raises ValueError"""
+        with pytest.raises(ValueError, match="odd number"):
+            read_hex(StringIO('abc'))
+
+    def test_read_hex_invalid_character(self):
+        """Test that non-hex characters raise ValueError"""
+        with pytest.raises(ValueError):
+            read_hex(StringIO('zz'))
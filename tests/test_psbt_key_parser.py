@@ -23,7 +23,7 @@ class TestParseKeyPsbtInWitnessUtxo:
 
         assert isinstance(result, PsbtKeyInWitnessUTXO)
         assert result.amount == amount
-        assert result.script_hash == script.hex()
+        assert result.script_hash == script
 
     def test_parse_witness_utxo_p2wsh(self):
         """Test parsing witness UTXO for P2WSH"""
@@ -37,8 +37,8 @@ class TestParseKeyPsbtInWitnessUtxo:
         result = PSBTKeyParser.parse_key_PSBT_IN_WITNESS_UTXO(data)
 
         assert result.amount == amount
-        assert result.script_hash == script.hex()
-        assert len(bytes.fromhex(result.script_hash)) == 34
+        assert result.script_hash == script
+        assert len(result.script_hash) == 34
 
     def test_parse_witness_utxo_zero_amount(self):
         """Test parsing witness UTXO with zero amount"""
@@ -50,7 +50,7 @@ class TestParseKeyPsbtInWitnessUtxo:
         result = PSBTKeyParser.parse_key_PSBT_IN_WITNESS_UTXO(data)
 
         assert result.amount == 0
-        assert result.script_hash == script.hex()
+        assert result.script_hash == script
 
     def test_parse_witness_utxo_large_amount(self):
         """Test parsing witness UTXO with large amount"""
@@ -146,6 +146,7 @@ class TestParseKeyPsbtOutBip32Derivation:
         assert result.indices == [44, 0, 0, 0, 10]
         assert result.hardened == [True, True, True, False, False]
         assert result.is_change == False
+        assert '"path": "m/44\'/0\'/0\'/0/10"' in result.to_string()
 
     def test_parse_bip32_derivation_testnet(self):
         """Test parsing BIP32 derivation for testnet (m/84'/1'/0'/0/0)"""
@@ -225,7 +226,7 @@ class TestParseKeyPsbtInNonWitnessUtxo:
         result = PSBTKeyParser.parse_key_PSBT_IN_NON_WITNESS_UTXO(tx_data)
 
         assert result is not None
-        assert result.version == version
+        assert result.version == int.from_bytes(version, 'little')
         assert len(result.inputs) == 1
         assert len(result.outputs) == 1
 
@@ -305,6 +306,11 @@ class TestParseKeyPsbtInOutputIndex:
 
         assert result == 4294967295
 
+    def test_parse_output_index_too_short(self):
+        """Test that a truncated output index raises ValueError"""
+        with pytest.raises(ValueError, match="Output index must be 4 bytes"):
+            PSBTKeyParser.parse_key_PSBT_IN_OUTPUT_INDEX(b'\x01\x00')
+
 
 class TestParseKeyPsbtOutAmount:
     """Test parse_key_PSBT_OUT_AMOUNT function"""
@@ -348,6 +354,11 @@ class TestParseKeyPsbtOutAmount:
 
         assert result == amount
 
+    def test_parse_out_amount_too_short(self):
+        """Test that a truncated amount raises ValueError"""
+        with pytest.raises(ValueError, match="Amount must be 8 bytes"):
+            PSBTKeyParser.parse_key_PSBT_OUT_AMOUNT(b'\x00' * 4)
+
 
 class TestParseKeyPsbtOutScript:
     """Test parse_key_PSBT_OUT_SCRIPT function"""
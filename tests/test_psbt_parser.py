@@ -1,6 +1,7 @@
 """
 Unit tests for parser/psbt_parser.py
 """
+import json
 import pytest
 from io import BytesIO
 from parser.psbt_parser import PSBTParser
@@ -59,6 +60,19 @@ class TestParseVal:
         assert val.val_len == 2
         assert buffer.read(1) == b'\xff'
 
+    def test_parse_val_raw_bytes(self):
+        """Test parsing a value from raw bytes instead of a BytesIO"""
+        val = PSBTParser.parse_val(b'\x02\xaa\xbb')
+
+        assert val.val_len == 2
+        assert val.val_data == b'\xaa\xbb'
+
+    def test_parse_val_truncated(self):
+        """Test that a value shorter than val_len raises ValueError"""
+        buffer = BytesIO(b'\x04\xaa\xbb')
+        with pytest.raises(ValueError, match="val_data length"):
+            PSBTParser.parse_val(buffer)
+
 
 class TestParseKey:
     """Test parse_key function"""
@@ -113,6 +127,19 @@ class TestParseKey:
         assert key.key_len == 3
         assert buffer.read(1) == b'\xff'
 
+    def test_parse_key_raw_bytes(self):
+        """Test parsing a key from raw bytes instead of a BytesIO"""
+        key = PSBTParser.parse_key(b'\x02\x06\xaa', PSBTMapType.INPUT)
+
+        assert key.key_type == 0x06
+        assert key.key_data == b'\xaa'
+
+    def test_parse_key_truncated(self):
+        """Test that a key shorter than key_len raises ValueError"""
+        buffer = BytesIO(b'\x05\x01\xaa')
+        with pytest.raises(ValueError, match="key_len"):
+            PSBTParser.parse_key(buffer, PSBTMapType.INPUT)
+
 
 class TestParseKeyVal:
     """Test parse_key_val function"""
@@ -140,6 +167,13 @@ class TestParseKeyVal:
         assert key_val.val.val_len == 3
         assert key_val.val.val_data == b'\xbb\xcc\xdd'
 
+    def test_parse_key_val_raw_bytes(self):
+        """Test parsing a key-value pair from raw bytes instead of a BytesIO"""
+        key_val = PSBTParser.parse_key_val(b'\x01\x00\x01\xaa', PSBTMapType.GLOBAL)
+
+        assert key_val.key.key_type == 0x00
+        assert key_val.val.val_data == b'\xaa'
+
     def test_parse_key_val_transaction_data(self):
         """Test parsing key-value with transaction data"""
         # Simplified transaction data
@@ -189,6 +223,17 @@ class TestParseMap:
         assert psbt_map.map[0].key.key_type == 0x00
         assert psbt_map.map[1].key.key_type == 0x01
         assert psbt_map.map[2].key.key_type == 0x02
+        assert psbt_map.by_type == {0x00: 0, 0x01: 1, 0x02: 2}
+
+    def test_parse_map_get_first_value(self):
+        """Test that get returns the first value for a key type, or None"""
+        # Entry 1: Key(2, 0x06, 0x01), Val(1, 0xaa)
+        # Entry 2: Key(2, 0x06, 0x02), Val(1, 0xbb)
+        buffer = BytesIO(b'\x02\x06\x01\x01\xaa\x02\x06\x02\x01\xbb\x00')
+        psbt_map = PSBTParser.parse_map(buffer, PSBTMapType.INPUT)
+
+        assert psbt_map.get(0x06) == b'\xaa'
+        assert psbt_map.get(0x07) is None
 
     def test_parse_map_buffer_position(self):
         """Test that buffer consumes terminator"""
@@ -198,6 +243,39 @@ class TestParseMap:
         # Should consume up to and including terminator
         assert buffer.read(1) == b'\xff'
 
+    def test_parse_map_raw_bytes(self):
+        """Test parsing a map from raw bytes instead of a BytesIO"""
+        assert len(PSBTParser.parse_map(b'\x00', PSBTMapType.GLOBAL).map) == 0
+        psbt_map = PSBTParser.parse_map(b'\x01\x00\x01\xaa\x00', PSBTMapType.GLOBAL)
+
+        assert psbt_map.get(0x00) == b'\xaa'
+
+    def test_parse_map_missing_terminator(self):
+        """Test that a map without a 0x00 terminator raises ValueError"""
+        buffer = BytesIO(b'\x01\x00\x01\xaa')
+        with pytest.raises(ValueError, match="terminator"):
+            PSBTParser.parse_map(buffer, PSBTMapType.OUTPUT)
+
+    def test_parse_map_truncated_value(self):
+        """Test that a truncated value inside a map raises ValueError"""
+        buffer = BytesIO(b'\x01\x00\x04\xaa\xbb')
+        with pytest.raises(ValueError, match="val_data length"):
+            PSBTParser.parse_map(buffer, PSBTMapType.INPUT)
+
+    def test_parse_map_multibyte_lengths(self):
+        """Test parsing map entries with 0xfd-prefixed key type and value length"""
+        # Key: length 4, type 0x00fc encoded as 0xfd 0xfc 0x00, 1 byte of key data
+        # Val: length 300 encoded as 0xfd 0x2c 0x01
+        data = b'\xab' * 300
+        buffer = BytesIO(b'\x04\xfd\xfc\x00\x11' + b'\xfd\x2c\x01' + data + b'\x00')
+        psbt_map = PSBTParser.parse_map(buffer, PSBTMapType.INPUT)
+
+        assert psbt_map.map[0].key.key_type == 0xfc
+        assert psbt_map.map[0].key.key_data == b'\x11'
+        assert psbt_map.map[0].val.val_len == 300
+        assert psbt_map.map[0].val.val_data == data
+        assert buffer.read() == b''
+
     def test_parse_map_global_type(self):
         """Test parsing GLOBAL map type"""
         buffer = BytesIO(b'\x01\x00\x04\x01\x02\x03\x04\x00')
@@ -386,3 +464,62 @@ class TestParsePsbt:
         assert len(psbt.input_maps) == 1
         assert len(psbt.output_maps) == 1
         assert len(psbt.output_maps[0].map) == 1
+
+    def test_parse_psbt_from_cursor(self):
+        """Test parsing PSBT from a Cursor over raw bytes"""
+        from parser.parser_utils import Cursor
+        magic = b'psbt\xff'
+        global_map = (
+            b'\x01\x02' + b'\x01\x02' +  # TX_VERSION = 2
+            b'\x01\x04' + b'\x01\x01' +  # INPUT_COUNT = 1
+            b'\x01\x05' + b'\x01\x00' +  # OUTPUT_COUNT = 0
+            b'\x00'  # terminator
+        )
+        input_map = b'\x01\x0e\x01\x07\x00'
+
+        cur = Cursor(magic + global_map + input_map + b'\xee')
+        psbt = PSBTParser.parse_psbt(cur)
+
+        assert psbt.version == 2
+        assert psbt.input_maps[0].map[0].val.val_data == b'\x07'
+        assert cur.read(1) == b'\xee'
+
+    def test_parse_psbt_bytesio_position(self):
+        """Test that parsing from BytesIO leaves the buffer after the PSBT"""
+        magic = b'psbt\xff'
+        global_map = b'\x01\x02\x01\x02' + b'\x00'
+
+        buffer = BytesIO(magic + global_map + b'\xee')
+        PSBTParser.parse_psbt(buffer)
+
+        assert buffer.read(1) == b'\xee'
+
+    def test_parse_psbt_to_dict_is_json_serializable(self):
+        """Test that to_dict hex-encodes key and value data like to_string"""
+        magic = b'psbt\xff'
+        global_map = (
+            b'\x01\x02' + b'\x01\x02' +  # TX_VERSION = 2
+            b'\x01\x04' + b'\x01\x00' +  # INPUT_COUNT = 0
+            b'\x01\x05' + b'\x01\x01' +  # OUTPUT_COUNT = 1
+            b'\x00'  # terminator
+        )
+        output_map = b'\x01\x02\x04\x11\x22\x33\x44\x00'
+
+        psbt = PSBTParser.parse_psbt(BytesIO(magic + global_map + output_map))
+        d = psbt.to_dict()
+
+        assert d["output_maps"][0][0]["val"]["val_data"] == "11223344"
+        assert json.loads(json.dumps(d)) == json.loads(psbt.to_string())
+
+    def test_parse_psbt_to_string_cache_cleared_on_assignment(self):
+        """Test that assigning a field rebuilds the cached JSON form"""
+        magic = b'psbt\xff'
+        global_map = b'\x01\x02\x01\x02' + b'\x00'
+
+        psbt = PSBTParser.parse_psbt(BytesIO(magic + global_map))
+        before = psbt.to_string()
+        psbt.output_maps = [PSBTMap(map=())]
+
+        assert psbt.to_string() != before
+        assert json.loads(psbt.to_string())["output_maps"] == [[]]
+        assert psbt.to_dict() is not psbt.to_dict()
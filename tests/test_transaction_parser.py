@@ -2,63 +2,35 @@
 Unit tests for parser/transaction_parser.py
 """
 import pytest
-from io import BytesIO
+from io import BytesIO, StringIO
 from parser.transaction_parser import TransactionParser
 from models.transaction import Transaction, TXInput, TXOutput, TXWitnessStack, TXWitnessStackItem
 
+# Single-byte compact sizes, indexed by value
+BYTE = tuple(bytes([i]) for i in range(256))
+
 
 class TestParseInput:
     """Test parse_input function"""
 
-    def test_parse_input_basic(self):
-        """Test parsing a basic transaction input"""
-        # Create a simple input: 32-byte txid, 4-byte vout, empty scriptSig, 4-byte sequence
-        txid = b'\x01' * 32
-        vout = b'\x02\x00\x00\x00'  # vout 2 in little-endian
-        ss_size = b'\x00'  # compact size 0
-        seq = b'\xff\xff\xff\xff'
-
-        buffer = BytesIO(txid + vout + ss_size + seq)
+    @pytest.mark.parametrize("txid,vout,ss,seq", [
+        # Basic input: empty scriptSig, vout 2
+        (b'\x01' * 32, b'\x02\x00\x00\x00', b'', b'\xff\xff\xff\xff'),
+        # Sample scriptSig data
+        (b'\xaa' * 32, b'\x01\x00\x00\x00', b'\x48\x30\x45', b'\xfe\xff\xff\xff'),
+        # Larger scriptSig (200 bytes)
+        (b'\xbb' * 32, b'\x05\x00\x00\x00', b'\x12\x34\x56\x78' * 50, b'\x00\x00\x00\x00')
+    ], ids=["basic", "with_scriptsig", "large_scriptsig"])
+    def test_parse_input(self, txid, vout, ss, seq):
+        """Test parsing a transaction input"""
+        buffer = BytesIO(txid + vout + BYTE[len(ss)] + ss + seq)
         tx_input = TransactionParser.parse_input(buffer)
 
         assert tx_input.txid == txid
-        assert tx_input.vout == vout
-        assert tx_input.ss_size == 0
-        assert tx_input.ss == b''
-        assert tx_input.seq == seq
-
-    def test_parse_input_with_scriptsig(self):
-        """Test parsing input with scriptSig"""
-        txid = b'\xaa' * 32
-        vout = b'\x01\x00\x00\x00'
-        ss = b'\x48\x30\x45'  # Sample scriptSig data
-        ss_size = bytes([len(ss)])  # compact size
-        seq = b'\xfe\xff\xff\xff'
-
-        buffer = BytesIO(txid + vout + ss_size + ss + seq)
-        tx_input = TransactionParser.parse_input(buffer)
-
-        assert tx_input.txid == txid
-        assert tx_input.vout == vout
-        assert tx_input.ss_size == 3
-        assert tx_input.ss == ss
-        assert tx_input.seq == seq
-
-    def test_parse_input_large_scriptsig(self):
-        """Test parsing input with larger scriptSig"""
-        txid = b'\xbb' * 32
-        vout = b'\x05\x00\x00\x00'
-        ss = b'\x12\x34\x56\x78' * 50  # 200 bytes
-        ss_size = bytes([200])
-        seq = b'\x00\x00\x00\x00'
-
-        buffer = BytesIO(txid + vout + ss_size + ss + seq)
-        tx_input = TransactionParser.parse_input(buffer)
-
-        assert tx_input.txid == txid
-        assert tx_input.ss_size == 200
-        assert len(tx_input.ss) == 200
+        assert tx_input.vout == int.from_bytes(vout, 'little')
+        assert tx_input.ss_size == len(ss)
         assert tx_input.ss == ss
+        assert tx_input.seq == int.from_bytes(seq, 'little')
 
     def test_parse_input_buffer_position(self):
         """Test that buffer position advances correctly"""
@@ -75,70 +47,55 @@ class TestParseInput:
         # Buffer should be positioned right after the input
         assert buffer.read(1) == b'\x99'
 
+    def test_parse_input_truncated(self):
+        """Test that a truncated input raises ValueError"""
+        buffer = BytesIO(b'\xcc' * 32 + b'\x00\x00\x00\x00' + b'\x05\xaa')
+        with pytest.raises(ValueError, match="ss length"):
+            TransactionParser.parse_input(buffer)
 
-class TestParseOutput:
-    """Test parse_output function"""
-
-    def test_parse_output_basic(self):
-        """Test parsing a basic transaction output"""
-        amount = 50000  # satoshis
-        amount_bytes = amount.to_bytes(8, byteorder='little')
-        spk = b'\x76\xa9\x14'  # Sample scriptPubKey
-        spk_size = bytes([len(spk)])
-
-        buffer = BytesIO(amount_bytes + spk_size + spk)
-        tx_output = TransactionParser.parse_output(buffer)
-
-        assert tx_output.amount == amount
-        assert tx_output.spk_size == 3
-        assert tx_output.spk == spk
+    def test_parse_input_truncated_prefix(self):
+        """Test that an input shorter than txid + vout raises ValueError"""
+        buffer = BytesIO(b'\xcc' * 30)
+        with pytest.raises(ValueError, match="Truncated input"):
+            TransactionParser.parse_input(buffer)
 
-    def test_parse_output_zero_amount(self):
-        """Test parsing output with zero amount"""
-        amount_bytes = b'\x00\x00\x00\x00\x00\x00\x00\x00'
-        spk = b'\x00\x14'
-        spk_size = bytes([len(spk)])
+    def test_parse_input_raw_bytes(self):
+        """Test that parse_input accepts raw bytes"""
+        tx_input = TransactionParser.parse_input(b'\x01' * 32 + b'\x02\x00\x00\x00' + b'\x00' + b'\xff' * 4)
 
-        buffer = BytesIO(amount_bytes + spk_size + spk)
-        tx_output = TransactionParser.parse_output(buffer)
+        assert tx_input.txid == b'\x01' * 32
+        assert tx_input.vout == 2
+        assert tx_input.ss == b''
+        assert tx_input.seq == 0xffffffff
 
-        assert tx_output.amount == 0
-        assert tx_output.spk_size == 2
-        assert tx_output.spk == spk
 
-    def test_parse_output_large_amount(self):
-        """Test parsing output with large amount (21M BTC in sats)"""
-        amount = 2100000000000000  # 21M BTC
-        amount_bytes = amount.to_bytes(8, byteorder='little')
-        spk = b'\xa9\x14' + b'\x12' * 20 + b'\x87'  # P2SH-like
-        spk_size = bytes([len(spk)])
+class TestParseOutput:
+    """Test parse_output function"""
 
-        buffer = BytesIO(amount_bytes + spk_size + spk)
+    @pytest.mark.parametrize("amount,spk", [
+        # Sample scriptPubKey
+        (50000, b'\x76\xa9\x14'),
+        # Zero amount
+        (0, b'\x00\x14'),
+        # Large amount (21M BTC in sats), P2SH-like script
+        (2100000000000000, b'\xa9\x14' + b'\x12' * 20 + b'\x87'),
+        # P2WPKH: OP_0 OP_PUSHBYTES_20 <20 bytes>, 1 BTC
+        (100000000, b'\x00\x14' + b'\xaa' * 20)
+    ], ids=["basic", "zero_amount", "large_amount", "p2wpkh_script"])
+    def test_parse_output(self, amount, spk):
+        """Test parsing a transaction output"""
+        buffer = BytesIO(amount.to_bytes(8, byteorder='little') + BYTE[len(spk)] + spk)
         tx_output = TransactionParser.parse_output(buffer)
 
         assert tx_output.amount == amount
         assert tx_output.spk_size == len(spk)
-
-    def test_parse_output_p2wpkh_script(self):
-        """Test parsing output with P2WPKH scriptPubKey"""
-        amount = 100000000  # 1 BTC
-        amount_bytes = amount.to_bytes(8, byteorder='little')
-        # P2WPKH: OP_0 OP_PUSHBYTES_20 <20 bytes>
-        spk = b'\x00\x14' + b'\xaa' * 20
-        spk_size = bytes([len(spk)])
-
-        buffer = BytesIO(amount_bytes + spk_size + spk)
-        tx_output = TransactionParser.parse_output(buffer)
-
-        assert tx_output.amount == amount
-        assert tx_output.spk_size == 22
         assert tx_output.spk == spk
 
     def test_parse_output_buffer_position(self):
         """Test that buffer position advances correctly"""
         amount_bytes = (10000).to_bytes(8, byteorder='little')
         spk = b'\x76\xa9'
-        spk_size = bytes([len(spk)])
+        spk_size = BYTE[len(spk)]
         extra_data = b'\xde\xad\xbe\xef'
 
         buffer = BytesIO(amount_bytes + spk_size + spk + extra_data)
@@ -147,6 +104,109 @@ class TestParseOutput:
         # Buffer should be positioned right after the output
         assert buffer.read(1) == b'\xde'
 
+    def test_parse_output_truncated(self):
+        """Test that a truncated output raises ValueError"""
+        buffer = BytesIO((10000).to_bytes(8, byteorder='little') + b'\x04\x76')
+        with pytest.raises(ValueError, match="spk length"):
+            TransactionParser.parse_output(buffer)
+
+    def test_parse_output_raw_bytes(self):
+        """Test that parse_output accepts raw bytes"""
+        tx_output = TransactionParser.parse_output((10000).to_bytes(8, 'little') + b'\x02\x76\xa9')
+
+        assert tx_output.amount == 10000
+        assert tx_output.spk == b'\x76\xa9'
+
+
+class TestParseInputsOutputs:
+    """Test parse_inputs and parse_outputs functions"""
+
+    INPUTS = (b'\x11' * 32 + b'\x00\x00\x00\x00' + b'\x00' + b'\xff\xff\xff\xff' +
+              b'\x22' * 32 + b'\x03\x00\x00\x00' + b'\x02\xab\xcd' + b'\xfe\xff\xff\xff')
+    OUTPUTS = ((30000).to_bytes(8, 'little') + b'\x01\x51' +
+               (20000).to_bytes(8, 'little') + b'\xfd\x00\x01' + b'\x6a' * 256)
+
+    def test_parse_inputs_matches_parse_input(self):
+        """Test that batch parsing gives the same inputs as one at a time"""
+        buffer = BytesIO(self.INPUTS + b'\xee')
+        inputs = TransactionParser.parse_inputs(buffer, 2)
+
+        single = BytesIO(self.INPUTS)
+        assert inputs == [TransactionParser.parse_input(single) for _ in range(2)]
+        assert inputs[1].ss == b'\xab\xcd'
+        assert buffer.read(1) == b'\xee'
+
+    def test_parse_outputs_matches_parse_output(self):
+        """Test that batch parsing gives the same outputs as one at a time"""
+        buffer = BytesIO(self.OUTPUTS + b'\xee')
+        outputs = TransactionParser.parse_outputs(buffer, 2)
+
+        single = BytesIO(self.OUTPUTS)
+        assert outputs == [TransactionParser.parse_output(single) for _ in range(2)]
+        assert outputs[1].spk_size == 256
+        assert buffer.read(1) == b'\xee'
+
+    def test_parse_inputs_empty_scriptsigs(self):
+        """Test the fixed-size path taken when every scriptSig is empty"""
+        data = b''.join(bytes([i]) * 32 + i.to_bytes(4, 'little') + b'\x00' + b'\xfd\xff\xff\xff'
+                        for i in range(3))
+        buffer = BytesIO(data + b'\xee')
+        inputs = TransactionParser.parse_inputs(buffer, 3)
+
+        single = BytesIO(data)
+        assert inputs == [TransactionParser.parse_input(single) for _ in range(3)]
+        assert [inp.vout for inp in inputs] == [0, 1, 2]
+        assert buffer.read(1) == b'\xee'
+
+    def test_parse_inputs_truncated(self):
+        """Test that a missing input raises ValueError"""
+        with pytest.raises(ValueError, match="Truncated input"):
+            TransactionParser.parse_inputs(BytesIO(self.INPUTS), 3)
+
+    def test_parse_outputs_truncated_script(self):
+        """Test that a short scriptPubKey raises ValueError"""
+        with pytest.raises(ValueError, match="spk length"):
+            TransactionParser.parse_outputs(BytesIO(self.OUTPUTS[:-1]), 2)
+
+    def test_parse_inputs_outputs_raw_bytes(self):
+        """Test that parse_inputs and parse_outputs accept raw bytes"""
+        assert TransactionParser.parse_inputs(self.INPUTS, 2) == TransactionParser.parse_inputs(BytesIO(self.INPUTS), 2)
+        assert TransactionParser.parse_outputs(self.OUTPUTS, 2) == TransactionParser.parse_outputs(BytesIO(self.OUTPUTS), 2)
+
+
+class TestParseOutputAt:
+    """Test parse_output_at function"""
+
+    # SegWit transaction with 2 inputs (one with a scriptSig) and 3 outputs
+    TX_DATA = (b'\x02\x00\x00\x00' + b'\x00\x01' +  # version, marker, flag
+               b'\x02' +
+               b'\xaa' * 32 + b'\x00\x00\x00\x00' + b'\x02\x51\x52' + b'\xff\xff\xff\xff' +
+               b'\xbb' * 32 + b'\x01\x00\x00\x00' + b'\x00' + b'\xff\xff\xff\xff' +
+               b'\x03' +
+               (1000).to_bytes(8, 'little') + b'\x01\x51' +
+               (2000).to_bytes(8, 'little') + b'\x03\x52\x53\x54' +
+               (3000).to_bytes(8, 'little') + b'\x00' +
+               b'\x01\x01\xcc' + b'\x00' +  # witness
+               b'\x00\x00\x00\x00')  # locktime
+
+    def test_parse_output_at_matches_full_parse(self):
+        """Test that each output matches the one from a full parse"""
+        tx = TransactionParser.parse_transaction(BytesIO(self.TX_DATA))
+        for i in range(3):
+            output = TransactionParser.parse_output_at(BytesIO(self.TX_DATA), i)
+            assert output == tx.outputs[i]
+
+    def test_parse_output_at_middle(self):
+        """Test parsing the middle output"""
+        output = TransactionParser.parse_output_at(BytesIO(self.TX_DATA), 1)
+        assert output.amount == 2000
+        assert output.spk == b'\x52\x53\x54'
+
+    def test_parse_output_at_out_of_range(self):
+        """Test that an index past the last output raises ValueError"""
+        with pytest.raises(ValueError, match="out of range"):
+            TransactionParser.parse_output_at(BytesIO(self.TX_DATA), 3)
+
 
 class TestParseWitness:
     """Test parse_witness function"""
@@ -158,7 +218,7 @@ class TestParseWitness:
         witness_stacks = TransactionParser.parse_witness(buffer, 1)
 
         assert len(witness_stacks) == 1
-        assert len(witness_stacks[0].witness_items) == 0
+        assert len(witness_stacks[0]) == 0
 
     def test_parse_witness_single_input_one_item(self):
         """Test parsing witness data for single input with one stack item"""
@@ -168,9 +228,9 @@ class TestParseWitness:
         witness_stacks = TransactionParser.parse_witness(buffer, 1)
 
         assert len(witness_stacks) == 1
-        assert len(witness_stacks[0].witness_items) == 1
-        assert witness_stacks[0].witness_items[0].stack_item_size == 3
-        assert witness_stacks[0].witness_items[0].stack_item == item_data
+        assert len(witness_stacks[0]) == 1
+        assert witness_stacks[0][0][0] == 3
+        assert witness_stacks[0][0][1] == item_data
 
     def test_parse_witness_single_input_multiple_items(self):
         """Test parsing witness data with multiple stack items (typical P2WPKH)"""
@@ -180,15 +240,15 @@ class TestParseWitness:
 
         buffer = BytesIO(
             b'\x02' +  # 2 stack items
-            bytes([len(sig)]) + sig +
-            bytes([len(pubkey)]) + pubkey
+            BYTE[len(sig)] + sig +
+            BYTE[len(pubkey)] + pubkey
         )
         witness_stacks = TransactionParser.parse_witness(buffer, 1)
 
         assert len(witness_stacks) == 1
-        assert len(witness_stacks[0].witness_items) == 2
-        assert witness_stacks[0].witness_items[0].stack_item == sig
-        assert witness_stacks[0].witness_items[1].stack_item == pubkey
+        assert len(witness_stacks[0]) == 2
+        assert witness_stacks[0][0][1] == sig
+        assert witness_stacks[0][1][1] == pubkey
 
     def test_parse_witness_multiple_inputs(self):
         """Test parsing witness data for multiple inputs"""
@@ -199,17 +259,17 @@ class TestParseWitness:
         item2b = b'\xbb\xcc'
 
         buffer = BytesIO(
-            b'\x01' + bytes([len(item1)]) + item1 +  # Input 1
-            b'\x02' + bytes([len(item2a)]) + item2a + bytes([len(item2b)]) + item2b  # Input 2
+            b'\x01' + BYTE[len(item1)] + item1 +  # Input 1
+            b'\x02' + BYTE[len(item2a)] + item2a + BYTE[len(item2b)] + item2b  # Input 2
         )
         witness_stacks = TransactionParser.parse_witness(buffer, 2)
 
         assert len(witness_stacks) == 2
-        assert len(witness_stacks[0].witness_items) == 1
-        assert witness_stacks[0].witness_items[0].stack_item == item1
-        assert len(witness_stacks[1].witness_items) == 2
-        assert witness_stacks[1].witness_items[0].stack_item == item2a
-        assert witness_stacks[1].witness_items[1].stack_item == item2b
+        assert len(witness_stacks[0]) == 1
+        assert witness_stacks[0][0][1] == item1
+        assert len(witness_stacks[1]) == 2
+        assert witness_stacks[1][0][1] == item2a
+        assert witness_stacks[1][1][1] == item2b
 
     def test_parse_witness_empty_stack_items(self):
         """Test parsing witness with empty stack items"""
@@ -218,11 +278,11 @@ class TestParseWitness:
         witness_stacks = TransactionParser.parse_witness(buffer, 1)
 
         assert len(witness_stacks) == 1
-        assert len(witness_stacks[0].witness_items) == 2
-        assert witness_stacks[0].witness_items[0].stack_item_size == 0
-        assert witness_stacks[0].witness_items[0].stack_item == b''
-        assert witness_stacks[0].witness_items[1].stack_item_size == 0
-        assert witness_stacks[0].witness_items[1].stack_item == b''
+        assert len(witness_stacks[0]) == 2
+        assert witness_stacks[0][0][0] == 0
+        assert witness_stacks[0][0][1] == b''
+        assert witness_stacks[0][1][0] == 0
+        assert witness_stacks[0][1][1] == b''
 
     def test_parse_witness_large_stack_item(self):
         """Test parsing witness with large stack item"""
@@ -235,9 +295,22 @@ class TestParseWitness:
         witness_stacks = TransactionParser.parse_witness(buffer, 1)
 
         assert len(witness_stacks) == 1
-        assert len(witness_stacks[0].witness_items) == 1
-        assert witness_stacks[0].witness_items[0].stack_item_size == 1000
-        assert len(witness_stacks[0].witness_items[0].stack_item) == 1000
+        assert len(witness_stacks[0]) == 1
+        assert witness_stacks[0][0][0] == 1000
+        assert len(witness_stacks[0][0][1]) == 1000
+
+    def test_parse_witness_truncated(self):
+        """Test that a truncated stack item raises ValueError"""
+        buffer = BytesIO(b'\x01' + b'\x03\xaa')
+        with pytest.raises(ValueError, match="stack_item length"):
+            TransactionParser.parse_witness(buffer, 1)
+
+    def test_parse_witness_raw_bytes(self):
+        """Test that parse_witness accepts raw bytes"""
+        witness_stacks = TransactionParser.parse_witness(b'\x01\x02\xab\xcd', 1)
+
+        assert witness_stacks[0][0][0] == 2
+        assert witness_stacks[0][0][1] == b'\xab\xcd'
 
 
 class TestParseTransaction:
@@ -256,7 +329,7 @@ class TestParseTransaction:
         output_count = b'\x01'
         amount = (50000).to_bytes(8, byteorder='little')
         spk = b'\x76\xa9\x14' + b'\xbb' * 20 + b'\x88\xac'
-        spk_size = bytes([len(spk)])
+        spk_size = BYTE[len(spk)]
         # locktime
         locktime = b'\x00\x00\x00\x00'
 
@@ -266,12 +339,12 @@ class TestParseTransaction:
         buffer = BytesIO(tx_data)
         tx = TransactionParser.parse_transaction(buffer)
 
-        assert tx.version == version
+        assert tx.version == int.from_bytes(version, 'little')
         assert tx.witness_flag == b'\x00' or tx.witness_flag == 0
         assert len(tx.inputs) == 1
         assert len(tx.outputs) == 1
         assert len(tx.witness) == 0
-        assert tx.locktime == locktime
+        assert tx.locktime == int.from_bytes(locktime, 'little')
 
     def test_parse_transaction_segwit_detection(self):
         """Test that SegWit transactions are detected correctly"""
@@ -288,7 +361,7 @@ class TestParseTransaction:
         output_count = b'\x01'
         amount = (100000).to_bytes(8, byteorder='little')
         spk = b'\x00\x14' + b'\xdd' * 20  # P2WPKH
-        spk_size = bytes([len(spk)])
+        spk_size = BYTE[len(spk)]
         # witness data (1 input, 2 stack items for P2WPKH)
         witness = b'\x02\x47' + b'\x30' * 71 + b'\x21' + b'\x02' * 33
         # locktime
@@ -300,9 +373,10 @@ class TestParseTransaction:
         buffer = BytesIO(tx_data)
         tx = TransactionParser.parse_transaction(buffer)
 
-        assert tx.version == version
+        assert tx.version == int.from_bytes(version, 'little')
         assert tx.witness_flag == int.from_bytes(flag, byteorder='little')
         assert len(tx.witness) == 1
+        assert tx.witness[0] == [(0x47, b'\x30' * 71), (0x21, b'\x02' * 33)]
         assert tx.vbytes > 0
 
     def test_parse_transaction_multiple_inputs_outputs(self):
@@ -326,7 +400,7 @@ class TestParseTransaction:
 
         assert len(tx.inputs) == 2
         assert len(tx.outputs) == 2
-        assert tx.locktime == locktime
+        assert tx.locktime == int.from_bytes(locktime, 'little')
         assert tx.inputs[0].txid == b'\x11' * 32
         assert tx.inputs[1].txid == b'\x22' * 32
 
@@ -354,6 +428,86 @@ class TestParseTransaction:
         expected_size = len(tx_data)
         assert tx.vbytes == expected_size
 
+    def test_parse_transaction_vbytes_ignores_trailing_data(self):
+        """Test that vbytes only counts the bytes of the transaction itself"""
+        tx_data = (b'\x01\x00\x00\x00' +  # version
+                   b'\x01' + b'\xee' * 32 + b'\x00\x00\x00\x00' + b'\x00' + b'\xff\xff\xff\xff' +  # 1 input
+                   b'\x01' + (50000).to_bytes(8, 'little') + b'\x01\x51' +  # 1 output
+                   b'\x00\x00\x00\x00')  # locktime
+
+        buffer = BytesIO(b'\xaa\xbb' + tx_data + b'\xcc' * 10)
+        buffer.read(2)
+        tx = TransactionParser.parse_transaction(buffer)
+
+        assert tx.vbytes == len(tx_data)
+        assert buffer.read(1) == b'\xcc'
+
+    def test_parse_transaction_one_input_two_outputs(self):
+        """Test the common one-input, two-output shape, legacy and SegWit"""
+        body = (b'\x01' + b'\x33' * 32 + b'\x07\x00\x00\x00' + b'\x00' + b'\xfd\xff\xff\xff' +
+                b'\x02' + (70000).to_bytes(8, 'little') + b'\x16\x00\x14' + b'\x44' * 20 +
+                (29000).to_bytes(8, 'little') + b'\x01\x51')
+        witness = b'\x01\x02\xab\xcd'
+        legacy = TransactionParser.parse_transaction(BytesIO(b'\x02\x00\x00\x00' + body + b'\x00\x00\x00\x00'))
+        segwit = TransactionParser.parse_transaction(
+            BytesIO(b'\x02\x00\x00\x00' + b'\x00\x01' + body + witness + b'\x00\x00\x00\x00'))
+
+        for tx in (legacy, segwit):
+            assert len(tx.inputs) == 1
+            assert tx.inputs[0].vout == 7
+            assert tx.inputs[0].ss == b''
+            assert [out.amount for out in tx.outputs] == [70000, 29000]
+            assert tx.outputs[1].spk == b'\x51'
+        assert legacy.vbytes == 4 + len(body) + 4
+        assert segwit.witness == [[(2, b'\xab\xcd')]]
+        # Marker, flag and witness bytes count once toward weight, the rest four times
+        assert segwit.vbytes == (4 * legacy.vbytes + 2 + len(witness)) / 4
+
+    def test_parse_transaction_one_input_one_output(self):
+        """Test the one-input, one-output sweep shape"""
+        tx_data = (b'\x02\x00\x00\x00' + b'\x01' + b'\x33' * 32 + b'\x03\x00\x00\x00' + b'\x00' +
+                   b'\xff\xff\xff\xff' + b'\x01' + (70000).to_bytes(8, 'little') + b'\x01\x51' +
+                   b'\x00\x00\x00\x00' + b'\x99')
+        buffer = BytesIO(tx_data)
+        tx = TransactionParser.parse_transaction(buffer)
+
+        assert tx.inputs[0].vout == 3
+        assert [(out.amount, out.spk) for out in tx.outputs] == [(70000, b'\x51')]
+        assert tx.vbytes == len(tx_data) - 1
+        assert buffer.read(1) == b'\x99'
+
+    def test_parse_transaction_one_input_two_outputs_truncated(self):
+        """Test that a truncated second output still raises ValueError"""
+        tx_data = (b'\x02\x00\x00\x00' + b'\x01' + b'\x33' * 32 + b'\x00\x00\x00\x00' + b'\x00' +
+                   b'\xff\xff\xff\xff' + b'\x02' + (70000).to_bytes(8, 'little') + b'\x01\x51' +
+                   (29000).to_bytes(8, 'little') + b'\x16\x00\x14')
+        with pytest.raises(ValueError, match="spk length"):
+            TransactionParser.parse_transaction(BytesIO(tx_data))
+
+    def test_parse_transaction_empty_inputs_outputs(self):
+        """Test that a zero input count is not mistaken for a SegWit marker"""
+        tx_data = (b'\x01\x00\x00\x00' +  # version
+                   b'\x00' +  # input count 0
+                   b'\x00' +  # output count 0
+                   b'\x00\x00\x00\x00')  # locktime
+
+        tx = TransactionParser.parse_transaction(tx_data)
+
+        assert tx.inputs == []
+        assert tx.outputs == []
+        assert tx.witness_flag == 0
+        assert tx.vbytes == len(tx_data)
+
+    def test_parse_transaction_truncated_locktime(self):
+        """Test that a transaction missing locktime bytes raises ValueError"""
+        tx_data = (b'\x01\x00\x00\x00' +  # version
+                   b'\x01' + b'\xee' * 32 + b'\x00\x00\x00\x00' + b'\x00' + b'\xff\xff\xff\xff' +  # 1 input
+                   b'\x01' + (50000).to_bytes(8, 'little') + b'\x01\x51' +  # 1 output
+                   b'\x00\x00')  # locktime cut short
+
+        with pytest.raises(ValueError, match="Truncated data"):
+            TransactionParser.parse_transaction(BytesIO(tx_data))
+
     def test_parse_transaction_minimal_valid(self):
         """Test parsing minimal valid transaction with 1 input and 1 output"""
         version = b'\x01\x00\x00\x00'
@@ -367,7 +521,7 @@ class TestParseTransaction:
         output_count = b'\x01'
         amount = (1000).to_bytes(8, 'little')
         spk = b'\x76\xa9\x14' + b'\xbb' * 20 + b'\x88\xac'  # P2PKH script
-        spk_size = bytes([len(spk)])
+        spk_size = BYTE[len(spk)]
         locktime = b'\x00\x00\x00\x00'
 
         tx_data = version + input_count + txid + vout + ss_size + seq + output_count + amount + spk_size + spk + locktime
@@ -378,3 +532,49 @@ class TestParseTransaction:
         assert len(tx.inputs) == 1
         assert len(tx.outputs) == 1
         assert tx.witness_flag == 0
+
+
+class TestTransactionToStream:
+    """Test Transaction.to_stream"""
+
+    TX_DATA = (b'\x02\x00\x00\x00' + b'\x00\x01' + b'\x01' +
+               b'\xcc' * 32 + b'\x01\x00\x00\x00' + b'\x00' + b'\xfe\xff\xff\xff' +
+               b'\x01' + (100000).to_bytes(8, 'little') + b'\x16' + b'\x00\x14' + b'\xdd' * 20 +
+               b'\x02\x47' + b'\x30' * 71 + b'\x21' + b'\x02' * 33 +
+               b'\x00\x00\x00\x00')
+
+    def test_to_stream_matches_to_string(self):
+        """Test that streamed output is identical to to_string"""
+        tx = TransactionParser.parse_transaction(BytesIO(self.TX_DATA))
+        out = StringIO()
+        tx.to_stream(out)
+
+        assert out.getvalue() == tx.to_string()
+
+    def test_to_stream_small_chunks(self, monkeypatch):
+        """Test that the stdlib encoder path batches writes by chunk size"""
+        import models.json_utils as json_utils
+        monkeypatch.setattr(json_utils, "orjson", None)
+        tx = TransactionParser.parse_transaction(BytesIO(self.TX_DATA))
+        writes = []
+
+        class Recorder:
+            def write(self, s):
+                writes.append(s)
+
+        json_utils.dump(tx.to_dict(), Recorder(), chunk_size=64)
+
+        assert len(writes) > 1
+        assert ''.join(writes) == tx.to_string()
+
+
+class TestGetWitnessStacks:
+    """Test Transaction.get_witness_stacks"""
+
+    def test_get_witness_stacks(self):
+        """Test that witness tuples convert to TXWitnessStack objects with the same dict form"""
+        tx = TransactionParser.parse_transaction(BytesIO(TestTransactionToStream.TX_DATA))
+        stacks = tx.get_witness_stacks()
+
+        assert stacks == [TXWitnessStack([TXWitnessStackItem(71, b'\x30' * 71), TXWitnessStackItem(33, b'\x02' * 33)])]
+        assert [stack.to_dict() for stack in stacks] == tx.to_dict()["witness"]